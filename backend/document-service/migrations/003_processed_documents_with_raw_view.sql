@@ -0,0 +1,26 @@
+-- Flat, pre-joined view of processed documents and their raw document fields.
+-- Listing queries read this view so name filters and ordering are plain column
+-- operations the planner can join/index instead of a per-row embedded subquery.
+-- raw_documents.status is exposed as raw_status to avoid clashing with
+-- processed_documents.status.
+--
+-- security_invoker makes the view check the caller's rights and the RLS of the
+-- base tables instead of the owner's. Only the document service (service_role)
+-- reads it, so the public anon key gets no access through the view.
+
+CREATE OR REPLACE VIEW public.processed_documents_with_raw
+WITH (security_invoker = true) AS
+SELECT
+  p.*,
+  r.document_name,
+  r.document_type,
+  r.link,
+  r.uploaded_by,
+  r.upload_date,
+  r.file_size,
+  r.file_hash,
+  r.status AS raw_status
+FROM public.processed_documents p
+LEFT JOIN public.raw_documents r ON r.document_id = p.document_id;
+
+GRANT SELECT ON public.processed_documents_with_raw TO service_role;
@@ -0,0 +1,22 @@
+-- Extend processed_documents_with_raw with the company name so listings no
+-- longer need a second round-trip to the companies table.
+-- CREATE OR REPLACE VIEW may only append columns, so company_name is last.
+
+CREATE OR REPLACE VIEW public.processed_documents_with_raw
+WITH (security_invoker = true) AS
+SELECT
+  p.*,
+  r.document_name,
+  r.document_type,
+  r.link,
+  r.uploaded_by,
+  r.upload_date,
+  r.file_size,
+  r.file_hash,
+  r.status AS raw_status,
+  c.company_name
+FROM public.processed_documents p
+LEFT JOIN public.raw_documents r ON r.document_id = p.document_id
+LEFT JOIN public.companies c ON c.company_id = p.company;
+
+GRANT SELECT ON public.processed_documents_with_raw TO service_role;
@@ -0,0 +1,14 @@
+-- One explanation per (process, level, source) so repeated tag updates can be
+-- written with a single upsert that skips rows already stored.
+-- Used by DatabaseService.create_explanations (on_conflict target).
+
+DELETE FROM public.explanations e
+USING public.explanations newer
+WHERE e.process_id = newer.process_id
+  AND e.classification_level = newer.classification_level
+  AND e.source_service = newer.source_service
+  AND e.explanation_id < newer.explanation_id;
+
+ALTER TABLE public.explanations
+  ADD CONSTRAINT explanations_process_level_source_key
+  UNIQUE (process_id, classification_level, source_service);
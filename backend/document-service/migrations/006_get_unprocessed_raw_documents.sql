@@ -0,0 +1,17 @@
+-- Raw documents with no processed_documents row yet, oldest first.
+-- Replaces fetching both tables and diffing them in Python.
+-- Called from DatabaseService.get_unprocessed_documents.
+
+CREATE OR REPLACE FUNCTION public.get_unprocessed_raw_documents(p_limit integer DEFAULT 1)
+RETURNS SETOF public.raw_documents
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT r.*
+  FROM public.raw_documents r
+  WHERE NOT EXISTS (
+    SELECT 1 FROM public.processed_documents p WHERE p.document_id = r.document_id
+  )
+  ORDER BY r.document_id
+  LIMIT p_limit;
+$$;
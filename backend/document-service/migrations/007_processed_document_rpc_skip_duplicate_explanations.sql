@@ -0,0 +1,47 @@
+-- Recreate create_processed_document_with_explanations so duplicate
+-- explanations in the payload are skipped instead of failing the insert,
+-- matching the upsert used by DatabaseService.create_explanations.
+-- Requires the unique constraint from 005.
+
+CREATE OR REPLACE FUNCTION public.create_processed_document_with_explanations(
+  doc jsonb,
+  explanations jsonb DEFAULT '[]'::jsonb
+)
+RETURNS public.processed_documents
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  created public.processed_documents;
+BEGIN
+  INSERT INTO public.processed_documents (
+    document_id, model_id, threshold_pct, suggested_tags, confirmed_tags,
+    user_added_labels, user_removed_tags, user_reviewed, user_id, company,
+    ocr_used, processing_ms, errors, saved_training, saved_count, request_id, status
+  )
+  SELECT
+    d.document_id, d.model_id, d.threshold_pct, d.suggested_tags, d.confirmed_tags,
+    d.user_added_labels, d.user_removed_tags, d.user_reviewed, d.user_id, d.company,
+    d.ocr_used, d.processing_ms, d.errors, d.saved_training, d.saved_count, d.request_id, d.status
+  FROM jsonb_populate_record(NULL::public.processed_documents, doc) AS d
+  RETURNING * INTO created;
+
+  INSERT INTO public.explanations (
+    process_id, classification_level, predicted_tag, confidence,
+    reasoning, source_service, service_response
+  )
+  SELECT
+    created.process_id, e.classification_level, e.predicted_tag, e.confidence,
+    e.reasoning, e.source_service, e.service_response
+  FROM jsonb_to_recordset(COALESCE(explanations, '[]'::jsonb)) AS e(
+    classification_level varchar,
+    predicted_tag varchar,
+    confidence numeric,
+    reasoning text,
+    source_service varchar,
+    service_response jsonb
+  )
+  ON CONFLICT (process_id, classification_level, source_service) DO NOTHING;
+
+  RETURN created;
+END;
+$$;
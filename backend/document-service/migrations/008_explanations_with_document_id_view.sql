@@ -0,0 +1,14 @@
+-- Explanations with their document_id exposed as a plain column so they can
+-- be filtered by document without an embedded join.
+-- Read by DatabaseService.get_explanations_for_document, so like 003 it runs
+-- with the caller's rights and is granted to service_role only.
+
+CREATE OR REPLACE VIEW public.explanations_with_document_id
+WITH (security_invoker = true) AS
+SELECT
+  e.*,
+  p.document_id
+FROM public.explanations e
+JOIN public.processed_documents p ON p.process_id = e.process_id;
+
+GRANT SELECT ON public.explanations_with_document_id TO service_role;
@@ -0,0 +1,7 @@
+-- processed_documents is looked up by document_id (tag updates, the
+-- unprocessed-documents anti-join in 006, the listing view join), but only
+-- process_id is indexed. The explanations upsert key is already backed by
+-- the unique constraint added in 005.
+
+CREATE INDEX IF NOT EXISTS idx_processed_documents_document_id
+  ON public.processed_documents (document_id);
@@ -0,0 +1,9 @@
+-- Trigram index so the substring search (ilike '%term%') used by
+-- search_documents and get_total_documents_count can use an index scan
+-- instead of scanning raw_documents. The filter is applied through the
+-- processed_documents_with_raw view, which exposes r.document_name as-is.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_raw_documents_name_trgm
+  ON public.raw_documents USING gin (document_name gin_trgm_ops);
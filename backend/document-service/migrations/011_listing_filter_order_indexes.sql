@@ -0,0 +1,12 @@
+-- Composite indexes matching the filtered listings, so each filter and its
+-- keyset ORDER BY / `> cursor` predicate are served by one index range scan
+-- with no sort node:
+--   get_documents_by_company: processed_documents WHERE company = ? ORDER BY process_id
+--   get_documents_by_status:  raw_documents WHERE status = ? ORDER BY document_id
+-- (Unfiltered listings use the process_id primary key.)
+
+CREATE INDEX IF NOT EXISTS idx_processed_documents_company_process_id
+  ON public.processed_documents (company, process_id);
+
+CREATE INDEX IF NOT EXISTS idx_raw_documents_status_document_id
+  ON public.raw_documents (status, document_id);
@@ -0,0 +1,68 @@
+-- Apply a user's tag review to a document's processed row in one
+-- transaction/round-trip: locate the row by document_id, upsert any
+-- explanations sent with the review, and update the tag arrays.
+-- NULL tag/user arguments leave the stored value unchanged. Returns no row
+-- when the document has not been processed.
+-- Called from DatabaseService.update_document_tags. Requires the unique
+-- constraint from 005.
+
+CREATE OR REPLACE FUNCTION public.update_processed_tags(
+  p_document_id bigint,
+  p_confirmed text[] DEFAULT NULL,
+  p_added text[] DEFAULT NULL,
+  p_removed text[] DEFAULT NULL,
+  p_user_id bigint DEFAULT NULL,
+  p_explanations jsonb DEFAULT '[]'::jsonb
+)
+RETURNS TABLE (
+  process_id bigint,
+  document_id bigint,
+  user_reviewed boolean,
+  reviewed_at timestamptz,
+  user_id bigint
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  target bigint;
+BEGIN
+  SELECT p.process_id INTO target
+  FROM public.processed_documents p
+  WHERE p.document_id = p_document_id
+  ORDER BY p.process_id
+  LIMIT 1;
+
+  IF target IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO public.explanations (
+    process_id, classification_level, predicted_tag, confidence,
+    reasoning, source_service, service_response
+  )
+  SELECT
+    target, e.classification_level, e.predicted_tag, e.confidence,
+    e.reasoning, e.source_service, e.service_response
+  FROM jsonb_to_recordset(COALESCE(p_explanations, '[]'::jsonb)) AS e(
+    classification_level varchar,
+    predicted_tag varchar,
+    confidence numeric,
+    reasoning text,
+    source_service varchar,
+    service_response jsonb
+  )
+  ON CONFLICT (process_id, classification_level, source_service) DO NOTHING;
+
+  RETURN QUERY
+  UPDATE public.processed_documents p
+  SET confirmed_tags = COALESCE(p_confirmed, p.confirmed_tags),
+      user_added_labels = COALESCE(p_added, p.user_added_labels),
+      user_removed_tags = COALESCE(p_removed, p.user_removed_tags),
+      user_id = COALESCE(p_user_id, p.user_id),
+      user_reviewed = true,
+      reviewed_at = now()
+  WHERE p.process_id = target
+  RETURNING p.process_id, p.document_id, p.user_reviewed, p.reviewed_at, p.user_id;
+END;
+$$;
@@ -0,0 +1,18 @@
+-- raw_documents.status is free text, so only the document service's own
+-- validation keeps it to the known lifecycle values; direct writes from other
+-- services or the SQL editor can store anything. Enforce the same set as
+-- DOCUMENT_STATUSES in services/database.py with a CHECK constraint, matching
+-- how explanations constrains classification_level and source_service.
+--
+-- A CHECK is used rather than an enum type: changing the column type would
+-- mean dropping and recreating the views that select it (003/004), and adding
+-- a status later is a constraint swap instead of ALTER TYPE.
+--
+-- The constraint is added NOT VALID, so this statement only holds its
+-- ACCESS EXCLUSIVE lock briefly and checks new writes only. Existing rows are
+-- checked by 015, which must run as a separate script: in one transaction the
+-- lock taken here would be held for the whole validation scan.
+
+ALTER TABLE public.raw_documents
+  ADD CONSTRAINT raw_documents_status_check
+  CHECK (status IN ('uploaded', 'processing', 'processed', 'failed')) NOT VALID;
@@ -0,0 +1,128 @@
+-- Make explanation writes keep the latest explanation per (process, level,
+-- source) instead of the first one.
+--
+-- 005 deduplicated existing rows by keeping the newest, but 007 and 012
+-- inserted with ON CONFLICT DO NOTHING, so a later review's explanation was
+-- silently dropped. Both functions now overwrite the stored row with the
+-- incoming one (DO UPDATE), matching what 005 preserved.
+--
+-- DO UPDATE cannot touch the same row twice in one statement, so duplicate
+-- keys within a payload are collapsed first, keeping the last one sent.
+
+CREATE OR REPLACE FUNCTION public.create_processed_document_with_explanations(
+  doc jsonb,
+  explanations jsonb DEFAULT '[]'::jsonb
+)
+RETURNS public.processed_documents
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  created public.processed_documents;
+BEGIN
+  INSERT INTO public.processed_documents (
+    document_id, model_id, threshold_pct, suggested_tags, confirmed_tags,
+    user_added_labels, user_removed_tags, user_reviewed, user_id, company,
+    ocr_used, processing_ms, errors, saved_training, saved_count, request_id, status
+  )
+  SELECT
+    d.document_id, d.model_id, d.threshold_pct, d.suggested_tags, d.confirmed_tags,
+    d.user_added_labels, d.user_removed_tags, d.user_reviewed, d.user_id, d.company,
+    d.ocr_used, d.processing_ms, d.errors, d.saved_training, d.saved_count, d.request_id, d.status
+  FROM jsonb_populate_record(NULL::public.processed_documents, doc) AS d
+  RETURNING * INTO created;
+
+  INSERT INTO public.explanations (
+    process_id, classification_level, predicted_tag, confidence,
+    reasoning, source_service, service_response
+  )
+  SELECT DISTINCT ON (e.classification_level, e.source_service)
+    created.process_id, e.classification_level, e.predicted_tag, e.confidence,
+    e.reasoning, e.source_service, e.service_response
+  FROM jsonb_array_elements(COALESCE(explanations, '[]'::jsonb)) WITH ORDINALITY AS item(value, ord)
+  CROSS JOIN LATERAL jsonb_to_record(item.value) AS e(
+    classification_level varchar,
+    predicted_tag varchar,
+    confidence numeric,
+    reasoning text,
+    source_service varchar,
+    service_response jsonb
+  )
+  ORDER BY e.classification_level, e.source_service, item.ord DESC
+  ON CONFLICT (process_id, classification_level, source_service) DO UPDATE
+  SET predicted_tag = EXCLUDED.predicted_tag,
+      confidence = EXCLUDED.confidence,
+      reasoning = EXCLUDED.reasoning,
+      service_response = EXCLUDED.service_response,
+      updated_at = CURRENT_TIMESTAMP;
+
+  RETURN created;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.update_processed_tags(
+  p_document_id bigint,
+  p_confirmed text[] DEFAULT NULL,
+  p_added text[] DEFAULT NULL,
+  p_removed text[] DEFAULT NULL,
+  p_user_id bigint DEFAULT NULL,
+  p_explanations jsonb DEFAULT '[]'::jsonb
+)
+RETURNS TABLE (
+  process_id bigint,
+  document_id bigint,
+  user_reviewed boolean,
+  reviewed_at timestamptz,
+  user_id bigint
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+  target bigint;
+BEGIN
+  SELECT p.process_id INTO target
+  FROM public.processed_documents p
+  WHERE p.document_id = p_document_id
+  ORDER BY p.process_id
+  LIMIT 1;
+
+  IF target IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO public.explanations (
+    process_id, classification_level, predicted_tag, confidence,
+    reasoning, source_service, service_response
+  )
+  SELECT DISTINCT ON (e.classification_level, e.source_service)
+    target, e.classification_level, e.predicted_tag, e.confidence,
+    e.reasoning, e.source_service, e.service_response
+  FROM jsonb_array_elements(COALESCE(p_explanations, '[]'::jsonb)) WITH ORDINALITY AS item(value, ord)
+  CROSS JOIN LATERAL jsonb_to_record(item.value) AS e(
+    classification_level varchar,
+    predicted_tag varchar,
+    confidence numeric,
+    reasoning text,
+    source_service varchar,
+    service_response jsonb
+  )
+  ORDER BY e.classification_level, e.source_service, item.ord DESC
+  ON CONFLICT (process_id, classification_level, source_service) DO UPDATE
+  SET predicted_tag = EXCLUDED.predicted_tag,
+      confidence = EXCLUDED.confidence,
+      reasoning = EXCLUDED.reasoning,
+      service_response = EXCLUDED.service_response,
+      updated_at = CURRENT_TIMESTAMP;
+
+  RETURN QUERY
+  UPDATE public.processed_documents p
+  SET confirmed_tags = COALESCE(p_confirmed, p.confirmed_tags),
+      user_added_labels = COALESCE(p_added, p.user_added_labels),
+      user_removed_tags = COALESCE(p_removed, p.user_removed_tags),
+      user_id = COALESCE(p_user_id, p.user_id),
+      user_reviewed = true,
+      reviewed_at = now()
+  WHERE p.process_id = target
+  RETURNING p.process_id, p.document_id, p.user_reviewed, p.reviewed_at, p.user_id;
+END;
+$$;
@@ -0,0 +1,10 @@
+-- Validate the raw_documents status CHECK added NOT VALID in 013.
+--
+-- This must run as its own script, after 013 has committed. VALIDATE only
+-- takes a SHARE UPDATE EXCLUSIVE lock while it scans existing rows, but in the
+-- same transaction as 013 the ACCESS EXCLUSIVE lock from ADD CONSTRAINT would
+-- still be held for the whole scan. If it fails, fix the offending rows and
+-- re-run this file.
+
+ALTER TABLE public.raw_documents
+  VALIDATE CONSTRAINT raw_documents_status_check;
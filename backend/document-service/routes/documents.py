@@ -1,8 +1,9 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify
 from models.document import DocumentModel
 from models.response import APIResponse
-from services.database import DatabaseService
+from services.database import DatabaseService, MAX_LISTING_ROWS, TAG_FIELDS, encode_cursor, decode_cursor
 
 # Initialize blueprint and logger
 documents_bp = Blueprint('documents', __name__)
@@ -15,6 +16,12 @@ except Exception as e:
     logger.error(f"Failed to initialize database service: {str(e)}")
     db_service = None
 
+# Shared worker pool for overlapping independent database round-trips
+query_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='documents-query')
+
+# Validation message for PATCH /documents/<id>/tags, built once at import
+TAG_FIELDS_REQUIRED_MESSAGE = f"At least one of the following fields is required: {', '.join(TAG_FIELDS)}"
+
 @documents_bp.route('', methods=['GET'])
 def get_documents():
     """Get all documents with optional pagination and search"""
@@ -27,6 +34,7 @@ def get_documents():
         # Get query parameters
         limit = request.args.get('limit', type=int)
         offset = request.args.get('offset', type=int)
+        cursor = request.args.get('cursor', type=str)
         search = request.args.get('search', type=str)
         status = request.args.get('status', type=str)
         company_id = request.args.get('company_id', type=int)
@@ -38,21 +46,33 @@ def get_documents():
         if offset is not None and offset < 0:
             return APIResponse.validation_error("Offset must be non-negative")
         
-        # Get total count for pagination
-        total_count, count_error = db_service.get_total_documents_count(search, status, company_id)
-        if count_error:
-            logger.error(f"Database error getting count: {count_error}")
-            return APIResponse.internal_error("Failed to retrieve documents count")
+        after_id = None
+        if cursor:
+            try:
+                after_id = decode_cursor(cursor)
+            except ValueError:
+                return APIResponse.validation_error("Invalid cursor")
+        
+        # Get total count for pagination concurrently with the page fetch
+        count_future = query_executor.submit(db_service.get_total_documents_count, search, status, company_id)
         
         # Search, filter, or get all documents
+        # Status filtering returns raw documents, so its cursor is keyed on document_id
+        cursor_key = 'process_id'
         if search:
-            documents, error = db_service.search_documents(search, limit, offset)
+            documents, error = db_service.search_documents(search, limit, offset, after_id=after_id)
         elif status:
-            documents, error = db_service.get_documents_by_status(status, limit)
+            cursor_key = 'document_id'
+            documents, error = db_service.get_documents_by_status(status, limit, offset, after_id=after_id)
         elif company_id:
-            documents, error = db_service.get_documents_by_company(company_id, limit)
+            documents, error = db_service.get_documents_by_company(company_id, limit, offset, after_id=after_id)
         else:
-            documents, error = db_service.get_all_documents(limit, offset)
+            documents, error = db_service.get_all_documents(limit, offset, after_id=after_id)
+        
+        total_count, count_error = count_future.result()
+        if count_error:
+            logger.error(f"Database error getting count: {count_error}")
+            return APIResponse.internal_error("Failed to retrieve documents count")
         
         if error:
             logger.error(f"Database error: {error}")
@@ -64,12 +84,20 @@ def get_documents():
         current_page = (current_offset // current_limit) + 1
         total_pages = (total_count + current_limit - 1) // current_limit  # Ceiling division
         
+        # Opaque keyset cursor for the next page, taken from the last row of a full page;
+        # listings without a limit are capped at MAX_LISTING_ROWS, so a capped page gets one too
+        next_cursor = None
+        page_size = limit or MAX_LISTING_ROWS
+        if documents and len(documents) == page_size and documents[-1].get(cursor_key) is not None:
+            next_cursor = encode_cursor(documents[-1][cursor_key])
+        
         pagination_info = {
             "total": total_count,
             "page": current_page,
             "totalPages": total_pages,
             "limit": current_limit,
-            "offset": current_offset
+            "offset": current_offset,
+            "nextCursor": next_cursor
         }
         
         response_data = {
@@ -334,15 +362,12 @@ def update_document_tags(document_id):
             return APIResponse.validation_error("Request body cannot be empty")
         
         # Validate that at least one tag field is provided
-        valid_fields = ['confirmed_tags', 'user_added_labels', 'user_removed_tags', 'user_id', 'explanations']
-        tag_fields = ['confirmed_tags', 'user_added_labels', 'user_removed_tags']
-        
-        has_tag_field = any(field in data for field in tag_fields)
+        has_tag_field = any(field in data for field in TAG_FIELDS)
         if not has_tag_field:
-            return APIResponse.validation_error(f"At least one of the following fields is required: {', '.join(tag_fields)}")
+            return APIResponse.validation_error(TAG_FIELDS_REQUIRED_MESSAGE)
         
         # Validate array fields
-        for field in tag_fields:
+        for field in TAG_FIELDS:
             if field in data and not isinstance(data[field], list):
                 return APIResponse.validation_error(f"{field} must be an array")
         
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Optional
+
+
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry expiry"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict = {}
+        self._lock = threading.Lock()
+        # Bumped by clear(); lets a slow reader detect that it raced a write
+        self.generation = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Any, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, evicting the oldest entry when full.
+
+        When `generation` is given and clear() has run since it was read, the
+        value may predate that clear and is dropped instead of stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+
+def make_key(*args: Any, **kwargs: Any) -> str:
+    """Build a stable cache key from canonicalized call arguments"""
+    payload = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
@@ -1,11 +1,171 @@
 import os
+import base64
+import copy
+import json
 import logging
+from functools import lru_cache, wraps
 from typing import List, Optional, Dict, Any
-from supabase import create_client, Client
+import httpx
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 
+from services.cache import TTLCache, make_key
+
 load_dotenv()
 
+# Shared keep-alive connection pool so Supabase calls reuse TLS connections
+# instead of paying a handshake per request; idle connections are kept for
+# 5 minutes so bursty traffic does not reconnect after httpx's 5s default
+_HTTP_CLIENT = httpx.Client(
+    transport=httpx.HTTPTransport(
+        retries=1,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=300),
+    ),
+    timeout=10,
+)
+
+# Flat view joining processed_documents to raw_documents (migrations/003)
+LISTING_VIEW = 'processed_documents_with_raw'
+
+# raw_documents columns returned by the single-document and status endpoints
+RAW_DOCUMENT_COLUMNS = (
+    "document_id,document_name,document_type,link,uploaded_by,upload_date,"
+    "file_size,file_hash,status"
+)
+
+# View columns that are nested back under 'raw_documents' in API responses
+RAW_DOCUMENT_FIELDS = {
+    'document_name': 'document_name',
+    'document_type': 'document_type',
+    'link': 'link',
+    'uploaded_by': 'uploaded_by',
+    'upload_date': 'upload_date',
+    'file_size': 'file_size',
+    'file_hash': 'file_hash',
+    'raw_status': 'status',
+}
+_RAW_DOCUMENT_ITEMS = tuple(RAW_DOCUMENT_FIELDS.items())
+
+# Columns rendered by the document listing UI. Heavier processed_documents
+# columns (errors, request_id, processing stats) are left to detail lookups.
+LIST_COLUMNS = (
+    "process_id,document_id,status,company,threshold_pct,suggested_tags,"
+    "confirmed_tags,user_added_labels,user_reviewed,company_name," + ",".join(RAW_DOCUMENT_FIELDS)
+)
+
+# Flat view exposing explanations.document_id (migrations/008)
+EXPLANATIONS_VIEW = 'explanations_with_document_id'
+EXPLANATION_COLUMNS = (
+    "explanation_id,process_id,document_id,classification_level,predicted_tag,"
+    "confidence,reasoning,source_service,service_response,created_at"
+)
+
+# Values allowed by the explanations table CHECK constraints
+VALID_CLASSIFICATION_LEVELS = frozenset(('primary', 'secondary', 'tertiary'))
+VALID_EXPLANATION_SOURCES = frozenset(('ai', 'llm'))
+
+# Statuses allowed by the raw_documents status CHECK constraint (migration 013),
+# in display order for error messages
+DOCUMENT_STATUSES = ('uploaded', 'processing', 'processed', 'failed')
+VALID_DOCUMENT_STATUSES = frozenset(DOCUMENT_STATUSES)
+INVALID_STATUS_MESSAGE = f"Invalid status. Must be one of: {', '.join(DOCUMENT_STATUSES)}"
+
+# Postgres SQLSTATE reported by PostgREST when a CHECK constraint rejects a write
+CHECK_VIOLATION = '23514'
+
+# Tag columns writable through update_document_tags
+TAG_FIELDS = ('confirmed_tags', 'user_added_labels', 'user_removed_tags')
+# update_processed_tags argument for each tag column (migrations/012)
+TAG_RPC_PARAMS = {
+    'confirmed_tags': 'p_confirmed',
+    'user_added_labels': 'p_added',
+    'user_removed_tags': 'p_removed',
+}
+
+# Rows returned by a listing requested without a limit; matches Supabase's
+# default max-rows, so the cap is explicit rather than silent
+MAX_LISTING_ROWS = 1000
+
+# Listings with more rows than this (e.g. the default capped listing) are not
+# cached, so cache memory stays proportional to ordinary page sizes
+MAX_CACHED_ROWS = 100
+
+# Process-wide cache of listing and count results; DOCUMENT_QUERY_CACHE_TTL=0 disables it.
+# Single-document reads and the unprocessed-documents poll are not cached: they
+# need read-after-write across workers, and workers use the poll to claim work.
+_QUERY_CACHE = TTLCache(ttl=float(os.environ.get("DOCUMENT_QUERY_CACHE_TTL", "10")), maxsize=512)
+
+
+@lru_cache(maxsize=1)
+def _get_client(url: str, key: str) -> Client:
+    """Process-wide Supabase client so every DatabaseService shares one connection pool"""
+    options = ClientOptions(postgrest_client_timeout=10, httpx_client=_HTTP_CLIENT)
+    return create_client(url, key, options=options)
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque keyset cursor for the row after `last_id`"""
+    return base64.urlsafe_b64encode(json.dumps({'id': last_id}, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    """Recover the last id from encode_cursor output; raises ValueError if malformed"""
+    try:
+        last_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))['id']
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    # bool is an int subclass, but a True/False cursor is not a row id
+    if not isinstance(last_id, int) or isinstance(last_id, bool) or last_id < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return last_id
+
+
+def _ilike_pattern(term: str) -> str:
+    """Substring ILIKE pattern that matches `term` literally.
+
+    Backslash, % and _ are escaped for LIKE. PostgREST turns every * into %
+    before the query reaches Postgres, so no escape survives for it; * is sent
+    as the single-character wildcard instead, which still matches a literal *.
+    """
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('*', '_')
+    return f"%{escaped}%"
+
+
+def _cached_query(func):
+    """Cache successful (result, None) returns keyed by the call arguments.
+
+    Callers get their own copy of cached data. A result read while a write
+    cleared the cache is returned but not stored, so it cannot outlive the
+    write. Listings longer than MAX_CACHED_ROWS are never stored.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _QUERY_CACHE.ttl <= 0:
+            return func(self, *args, **kwargs)
+        key = make_key(func.__name__, *args, **kwargs)
+        cached = _QUERY_CACHE.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        generation = _QUERY_CACHE.generation
+        result = func(self, *args, **kwargs)
+        if result[1] is None and not (isinstance(result[0], list) and len(result[0]) > MAX_CACHED_ROWS):
+            _QUERY_CACHE.set(key, copy.deepcopy(result), generation=generation)
+        return result
+    return wrapper
+
+
+def _invalidates_queries(func):
+    """Drop cached read results after a write"""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _QUERY_CACHE.clear()
+    return wrapper
+
+
 class DatabaseService:
     """Database operations service with error handling"""
     
@@ -18,100 +178,131 @@ class DatabaseService:
             raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
         
         try:
-            self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+            self.supabase: Client = _get_client(self.supabase_url, self.supabase_key)
+            self._tables: Dict[str, Any] = {}
             self.logger.info("Database connection initialized")
         except Exception as e:
-            self.logger.error(f"Failed to initialize database connection: {str(e)}")
+            self.logger.error("Failed to initialize database connection: %s", e)
             raise
     
+    def _table(self, name: str):
+        """Memoized table request builder.
+
+        postgrest builders only hold the session, path and headers; each verb
+        (select/insert/update/...) starts a fresh request, so one handle per
+        table can be shared across queries.
+        """
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = self.supabase.table(name)
+        return table
+    
     def test_connection(self) -> tuple[bool, Optional[str]]:
         """Test database connection"""
         try:
             # Simple query to test connection
-            response = self.supabase.table('raw_documents').select("document_id").limit(1).execute()
+            response = self._table('raw_documents').select("document_id").limit(1).execute()
             self.logger.info("Database connection test successful")
             return True, None
         except Exception as e:
             error_msg = str(e)
-            self.logger.error(f"Database connection test failed: {error_msg}")
+            self.logger.error("Database connection test failed: %s", error_msg)
             return False, error_msg
     
+    @_cached_query
     def get_total_documents_count(self, search: Optional[str] = None, status: Optional[str] = None, company_id: Optional[int] = None) -> tuple[int, Optional[str]]:
-        """Get total count of processed documents with optional filters"""
+        """Get the total row count behind a GET /documents listing.
+
+        Filters follow the same precedence as the listing (search, then status,
+        then company) so the total matches the rows being paged. Unfiltered
+        counts default to PostgREST's "estimated" mode (exact for small tables,
+        planner estimate for large ones); filtered counts stay exact. The count
+        is read from a HEAD request so no rows are transferred.
+        """
         try:
-            # Build base query for counting processed documents
-            query = self.supabase.table('processed_documents').select("process_id", count="exact")
-            
-            # Apply filters
-            if status:
-                query = query.eq('status', status)
-            
-            if company_id:
-                query = query.eq('company', company_id)  # Company is now in processed_documents
+            count_mode = "exact" if (search or status or company_id) else "estimated"
+            
+            if search:
+                query = self._table(LISTING_VIEW).select(
+                    "process_id", count=count_mode, head=True
+                ).ilike('document_name', _ilike_pattern(search))
+            elif status:
+                # get_documents_by_status lists raw_documents, so count those rows
+                query = self._table('raw_documents').select(
+                    "document_id", count=count_mode, head=True
+                ).eq('status', status)
+            elif company_id:
+                query = self._table('processed_documents').select(
+                    "process_id", count=count_mode, head=True
+                ).eq('company', company_id)
+            else:
+                query = self._table('processed_documents').select("process_id", count=count_mode, head=True)
             
             response = query.execute()
             total_count = response.count if response.count is not None else 0
-            self.logger.info(f"Total processed documents count: {total_count}")
+            self.logger.info("Total processed documents count: %s", total_count)
             return total_count, None
         except Exception as e:
             error_msg = f"Failed to get processed documents count: {str(e)}"
             self.logger.error(error_msg)
             return 0, error_msg
 
-    def get_all_documents(self, limit: Optional[int] = None, offset: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
-        """Get all processed documents with document info from raw_documents"""
+    @staticmethod
+    def _paginate(query, key: str, limit: Optional[int], offset: Optional[int], after_id: Optional[int]):
+        """Order by `key` and apply keyset (key > after_id) or OFFSET pagination.
+
+        Keyset pages are an index range scan on `key`, so deep pages cost the
+        same as the first one; OFFSET is kept for page-number navigation.
+        Without a limit at most MAX_LISTING_ROWS rows are returned.
+        """
+        query = query.order(key)
+        if after_id is not None:
+            query = query.gt(key, after_id).limit(limit or MAX_LISTING_ROWS)
+        elif offset is not None and limit is not None:
+            # Use range for pagination: range(start, end) where end is inclusive
+            query = query.range(offset, offset + limit - 1)
+        else:
+            query = query.limit(limit or MAX_LISTING_ROWS)
+        return query
+    
+    @staticmethod
+    def _nest_raw_documents(rows: List[Dict]) -> List[Dict]:
+        """Move flat view columns back under 'raw_documents' to keep the API shape.
+
+        The joined company name is exposed as raw_documents.companies, which is
+        where the frontend reads it from.
+        """
+        for row in rows:
+            company_name = row.pop('company_name', None)
+            if row.get('document_name') is None:
+                for column, _ in _RAW_DOCUMENT_ITEMS:
+                    row.pop(column, None)
+                row['raw_documents'] = None
+                continue
+            raw = {key: row.pop(column, None) for column, key in _RAW_DOCUMENT_ITEMS}
+            company_id = row.get('company')
+            raw['companies'] = {
+                'company_id': company_id,
+                'company_name': company_name or 'Unknown Company'
+            } if company_id else None
+            row['raw_documents'] = raw
+        return rows
+
+    @_cached_query
+    def get_all_documents(self, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
+        """Get all processed documents with document info from raw_documents.
+
+        When after_id is given, keyset pagination is used (process_id > after_id)
+        instead of OFFSET so deep pages cost the same as the first one.
+        """
         try:
-            # Query processed_documents as primary table and join with raw_documents for document info
-            query = self.supabase.table('processed_documents').select("""
-                *,
-                raw_documents!document_id(
-                    document_name,
-                    document_type,
-                    link,
-                    uploaded_by,
-                    upload_date,
-                    file_size,
-                    file_hash,
-                    status
-                )
-            """)
-            
-            if offset is not None and limit is not None:
-                # Use range for pagination: range(start, end) where end is inclusive
-                query = query.range(offset, offset + limit - 1)
-            elif limit:
-                query = query.limit(limit)
-            
-            response = query.execute()
-            
-            # Fetch company names for processed documents that have company IDs
-            if response.data:
-                # Get unique company IDs from processed_documents.company (not raw_documents)
-                company_ids = set()
-                for doc in response.data:
-                    if doc.get('company'):
-                        company_ids.add(doc['company'])
-                
-                # Fetch company information if we have company IDs
-                company_names = {}
-                if company_ids:
-                    companies_response = self.supabase.table('companies').select('company_id, company_name').in_('company_id', list(company_ids)).execute()
-                    for company in companies_response.data:
-                        company_names[company['company_id']] = company['company_name']
-                
-                # Add company names to the documents
-                for doc in response.data:
-                    if doc.get('company'):
-                        company_id = doc['company']
-                        doc['raw_documents']['companies'] = {
-                            'company_id': company_id,
-                            'company_name': company_names.get(company_id, 'Unknown Company')
-                        }
-                    else:
-                        doc['raw_documents']['companies'] = None
+            # Query the pre-joined view for processed documents with raw document info
+            query = self._table(LISTING_VIEW).select(LIST_COLUMNS)
+            documents = self._paginate(query, 'process_id', limit, offset, after_id).execute().data
+            self._nest_raw_documents(documents)
             
-            self.logger.info(f"Retrieved {len(response.data)} processed documents")
-            return response.data, None
+            self.logger.info("Retrieved %d processed documents", len(documents))
+            return documents, None
         except Exception as e:
             error_msg = f"Failed to retrieve processed documents: {str(e)}"
             self.logger.error(error_msg)
@@ -120,27 +311,29 @@ class DatabaseService:
     def get_document_by_id(self, document_id: int) -> tuple[Optional[Dict], Optional[str]]:
         """Get document by ID"""
         try:
-            response = self.supabase.table('raw_documents').select("*").eq('document_id', document_id).execute()
+            # maybe_single() yields the row object itself, or None when nothing matched
+            response = self._table('raw_documents').select(RAW_DOCUMENT_COLUMNS).eq('document_id', document_id).maybe_single().execute()
             
-            if response.data:
-                self.logger.info(f"Retrieved document with ID: {document_id}")
-                return response.data[0], None
+            if response is not None:
+                self.logger.info("Retrieved document with ID: %s", document_id)
+                return response.data, None
             else:
-                self.logger.warning(f"Document with ID {document_id} not found")
+                self.logger.warning("Document with ID %s not found", document_id)
                 return None, f"Document with ID {document_id} not found"
         except Exception as e:
             error_msg = f"Failed to retrieve document {document_id}: {str(e)}"
             self.logger.error(error_msg)
             return None, error_msg
     
+    @_invalidates_queries
     def create_document(self, document_data: Dict[str, Any]) -> tuple[Optional[Dict], Optional[str]]:
         """Create a new document"""
         try:
-            response = self.supabase.table('raw_documents').insert(document_data).execute()
+            response = self._table('raw_documents').insert(document_data).execute()
             
             if response.data:
                 created_doc = response.data[0]
-                self.logger.info(f"Created document with ID: {created_doc.get('id')}")
+                self.logger.info("Created document with ID: %s", created_doc.get('id'))
                 return created_doc, None
             else:
                 error_msg = "Failed to create document - no data returned"
@@ -151,164 +344,111 @@ class DatabaseService:
             self.logger.error(error_msg)
             return None, error_msg
     
+    @_invalidates_queries
     def update_document(self, document_id: int, document_data: Dict[str, Any]) -> tuple[Optional[Dict], Optional[str]]:
         """Update an existing document"""
         try:
-            # First check if document exists
-            existing_doc, error = self.get_document_by_id(document_id)
-            if error:
-                return None, error
-            
-            if not existing_doc:
-                return None, f"Document with ID {document_id} not found"
-            
-            # Update the document
-            response = self.supabase.table('raw_documents').update(document_data).eq('document_id', document_id).execute()
+            # No pre-check: an UPDATE that matches no row returns no data
+            response = self._table('raw_documents').update(document_data).eq('document_id', document_id).execute()
             
             if response.data:
                 updated_doc = response.data[0]
-                self.logger.info(f"Updated document with ID: {document_id}")
+                self.logger.info("Updated document with ID: %s", document_id)
                 return updated_doc, None
             else:
-                error_msg = f"Failed to update document {document_id} - no data returned"
-                self.logger.error(error_msg)
-                return None, error_msg
+                self.logger.warning("Document with ID %s not found", document_id)
+                return None, f"Document with ID {document_id} not found"
         except Exception as e:
             error_msg = f"Failed to update document {document_id}: {str(e)}"
             self.logger.error(error_msg)
             return None, error_msg
     
+    @_invalidates_queries
     def delete_document(self, document_id: int) -> tuple[bool, Optional[str]]:
         """Delete a document"""
         try:
-            # First check if document exists
-            existing_doc, error = self.get_document_by_id(document_id)
-            if error:
-                return False, error
+            # No pre-check: a DELETE that matches no row returns no data
+            response = self._table('raw_documents').delete().eq('document_id', document_id).execute()
             
-            if not existing_doc:
+            if not response.data:
+                self.logger.warning("Document with ID %s not found", document_id)
                 return False, f"Document with ID {document_id} not found"
             
-            # Delete the document
-            response = self.supabase.table('raw_documents').delete().eq('document_id', document_id).execute()
-            
-            self.logger.info(f"Deleted document with ID: {document_id}")
+            self.logger.info("Deleted document with ID: %s", document_id)
             return True, None
         except Exception as e:
             error_msg = f"Failed to delete document {document_id}: {str(e)}"
             self.logger.error(error_msg)
             return False, error_msg
     
-    def search_documents(self, search_term: str, limit: Optional[int] = None, offset: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
-        """Search processed documents by document name"""
+    @_cached_query
+    def search_documents(self, search_term: str, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
+        """Search processed documents by document name, optionally after a process_id cursor"""
         try:
-            # Query processed_documents and join with raw_documents, then filter by document name
-            query = self.supabase.table('processed_documents').select("""
-                *,
-                raw_documents!document_id(
-                    document_name,
-                    document_type,
-                    link,
-                    uploaded_by,
-                    upload_date,
-                    file_size,
-                    file_hash,
-                    status
-                )
-            """)
-            
-            # Note: Filtering by joined table fields in Supabase can be tricky
-            # We'll get all processed documents first, then filter in Python
-            if offset is not None and limit is not None:
-                query = query.range(offset, offset + limit - 1)
-            elif limit:
-                query = query.limit(limit * 5)  # Get more records to account for filtering
+            # Filter by name server-side so pagination applies to matching rows only
+            query = self._table(LISTING_VIEW).select(LIST_COLUMNS).ilike('document_name', _ilike_pattern(search_term))
+            documents = self._paginate(query, 'process_id', limit, offset, after_id).execute().data
+            self._nest_raw_documents(documents)
             
-            response = query.execute()
-            
-            # Filter by document name in Python
-            filtered_documents = []
-            for doc in response.data:
-                if (doc.get('raw_documents') and 
-                    isinstance(doc['raw_documents'], dict) and
-                    search_term.lower() in doc['raw_documents'].get('document_name', '').lower()):
-                    filtered_documents.append(doc)
-            
-            # Apply limit after filtering
-            if limit:
-                filtered_documents = filtered_documents[:limit]
-            
-            self.logger.info(f"Search for '{search_term}' returned {len(filtered_documents)} processed documents")
-            return filtered_documents, None
+            self.logger.info("Search for '%s' returned %d processed documents", search_term, len(documents))
+            return documents, None
             
         except Exception as e:
             error_msg = f"Failed to search processed documents: {str(e)}"
             self.logger.error(error_msg)
             return [], error_msg
     
-    def get_documents_by_status(self, status: str, limit: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
-        """Get documents by status"""
+    @_cached_query
+    def get_documents_by_status(self, status: str, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
+        """Get raw documents by status, optionally after a document_id cursor"""
         try:
-            query = self.supabase.table('raw_documents').select("*").eq('status', status)
-            
-            if limit:
-                query = query.limit(limit)
-            
-            response = query.execute()
-            self.logger.info(f"Retrieved {len(response.data)} documents with status '{status}'")
-            return response.data, None
+            query = self._table('raw_documents').select(RAW_DOCUMENT_COLUMNS).eq('status', status)
+            documents = self._paginate(query, 'document_id', limit, offset, after_id).execute().data
+            self.logger.info("Retrieved %d documents with status '%s'", len(documents), status)
+            return documents, None
         except Exception as e:
             error_msg = f"Failed to get documents by status: {str(e)}"
             self.logger.error(error_msg)
             return [], error_msg
     
-    def get_documents_by_company(self, company_id: int, limit: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
-        """Get processed documents by company ID (company is now in processed_documents)"""
+    @_cached_query
+    def get_documents_by_company(self, company_id: int, limit: Optional[int] = None, offset: Optional[int] = None, after_id: Optional[int] = None) -> tuple[List[Dict], Optional[str]]:
+        """Get processed documents by company ID, optionally after a process_id cursor"""
         try:
-            query = self.supabase.table('processed_documents').select("""
-                *,
-                raw_documents!document_id(
-                    document_name,
-                    document_type,
-                    link,
-                    uploaded_by,
-                    upload_date,
-                    file_size,
-                    file_hash,
-                    status
-                )
-            """).eq('company', company_id)
-            
-            if limit:
-                query = query.limit(limit)
-            
-            response = query.execute()
-            self.logger.info(f"Retrieved {len(response.data)} processed documents for company {company_id}")
-            return response.data, None
+            query = self._table(LISTING_VIEW).select(LIST_COLUMNS).eq('company', company_id)
+            documents = self._paginate(query, 'process_id', limit, offset, after_id).execute().data
+            self._nest_raw_documents(documents)
+            self.logger.info("Retrieved %d processed documents for company %s", len(documents), company_id)
+            return documents, None
         except Exception as e:
             error_msg = f"Failed to get documents by company: {str(e)}"
             self.logger.error(error_msg)
             return [], error_msg
     
+    @_invalidates_queries
     def update_document_status(self, document_id: int, status: str) -> tuple[bool, Optional[str]]:
         """Update document status"""
         try:
-            valid_statuses = ['uploaded', 'processing', 'processed', 'failed']
-            if status not in valid_statuses:
-                return False, f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            # The table constraint is the source of truth; checking here only
+            # saves a round-trip for obviously bad input
+            if status not in VALID_DOCUMENT_STATUSES:
+                return False, INVALID_STATUS_MESSAGE
             
-            response = self.supabase.table('raw_documents').update({'status': status}).eq('document_id', document_id).execute()
+            response = self._table('raw_documents').update({'status': status}).eq('document_id', document_id).execute()
             
             if response.data:
-                self.logger.info(f"Updated document {document_id} status to '{status}'")
+                self.logger.info("Updated document %s status to '%s'", document_id, status)
                 return True, None
             else:
                 return False, f"Document with ID {document_id} not found"
         except Exception as e:
+            if getattr(e, 'code', None) == CHECK_VIOLATION:
+                return False, INVALID_STATUS_MESSAGE
             error_msg = f"Failed to update document status: {str(e)}"
             self.logger.error(error_msg)
             return False, error_msg
     
+    @_invalidates_queries
     def create_processed_document(self, document_data: Dict[str, Any]) -> tuple[Optional[Dict], Optional[str]]:
         """Create a new processed document entry with empty tag fields and explanations"""
         try:
@@ -339,21 +479,17 @@ class DatabaseService:
                 'status': document_data.get('status', 'api_processed')
             }
             
-            response = self.supabase.table('processed_documents').insert(processed_data).execute()
+            # Insert the document and its explanations atomically in one round-trip
+            explanation_rows = self._explanation_rows(document_data.get('explanations'))
+            response = self.supabase.rpc('create_processed_document_with_explanations', {
+                'doc': processed_data,
+                'explanations': explanation_rows
+            }).execute()
             
             if response.data:
-                created_doc = response.data[0]
+                created_doc = response.data[0] if isinstance(response.data, list) else response.data
                 process_id = created_doc.get('process_id')
-                self.logger.info(f"Created processed document with process_id: {process_id}")
-                
-                # Create explanations if provided
-                explanations = document_data.get('explanations', [])
-                if explanations:
-                    explanation_error = self.create_explanations(process_id, explanations)
-                    if explanation_error:
-                        self.logger.warning(f"Failed to create explanations: {explanation_error}")
-                        # Don't fail the whole operation, just log the warning
-                
+                self.logger.info("Created processed document with process_id: %s and %d explanations", process_id, len(explanation_rows))
                 return created_doc, None
             else:
                 error_msg = "Failed to create processed document - no data returned"
@@ -364,65 +500,41 @@ class DatabaseService:
             self.logger.error(error_msg)
             return None, error_msg
     
+    @_invalidates_queries
     def update_document_tags(self, document_id: int, tag_data: Dict[str, Any]) -> tuple[Optional[Dict], Optional[str]]:
-        """Update confirmed_tags, user_added_labels, and user_removed_tags for a processed document"""
+        """Update confirmed_tags, user_added_labels, and user_removed_tags for a processed document.
+
+        Explanations sent with the review are written in the same transaction,
+        so if they are rejected the tag update fails with them and nothing is
+        stored (invalid explanations are dropped before the call).
+        """
         try:
-            # First check if processed document exists for this document_id
-            existing_response = self.supabase.table('processed_documents').select("*").eq('document_id', document_id).execute()
+            params = {'p_document_id': document_id}
+            for field in TAG_FIELDS:
+                if field in tag_data:
+                    if not isinstance(tag_data[field], list):
+                        return None, f"{field} must be an array"
+                    params[TAG_RPC_PARAMS[field]] = tag_data[field]
             
-            if not existing_response.data:
-                return None, f"No processed document found for document_id {document_id}"
-            
-            existing_doc = existing_response.data[0]
-            process_id = existing_doc['process_id']
-            
-            # Prepare update data
-            update_data = {}
-            
-            if 'confirmed_tags' in tag_data:
-                if not isinstance(tag_data['confirmed_tags'], list):
-                    return None, "confirmed_tags must be an array"
-                update_data['confirmed_tags'] = tag_data['confirmed_tags']
+            if 'user_id' in tag_data:
+                params['p_user_id'] = tag_data['user_id']
             
-            if 'user_added_labels' in tag_data:
-                if not isinstance(tag_data['user_added_labels'], list):
-                    return None, "user_added_labels must be an array"
-                update_data['user_added_labels'] = tag_data['user_added_labels']
+            explanation_rows = self._explanation_rows(tag_data.get('explanations'))
+            if explanation_rows:
+                params['p_explanations'] = explanation_rows
             
-            if 'user_removed_tags' in tag_data:
-                if not isinstance(tag_data['user_removed_tags'], list):
-                    return None, "user_removed_tags must be an array"
-                update_data['user_removed_tags'] = tag_data['user_removed_tags']
+            # Lookup, explanations upsert and UPDATE run in one transaction (migrations/012)
+            response = self.supabase.rpc('update_processed_tags', params).execute()
             
-            # Mark as user reviewed and add review timestamp
-            update_data['user_reviewed'] = True
-            update_data['reviewed_at'] = 'now()'
-
-            if 'user_id' in tag_data:
-                update_data['user_id'] = tag_data['user_id']
-
-            if not update_data:
-                return None, "No valid tag data provided for update"
-
-            # Update the processed document
-            response = self.supabase.table('processed_documents').update(update_data).eq('process_id', process_id).execute()
-
             if response.data:
-                updated_doc = response.data[0]
-
-                # Handle explanations if provided
-                if 'explanations' in tag_data:
-                    explanation_error = self.create_explanations(process_id, tag_data['explanations'])
-                    if explanation_error:
-                        self.logger.warning(f"Failed to create explanations during tag update: {explanation_error}")
-                        # Don't fail the whole operation, just log the warning
-
-                self.logger.info(f"Updated tags for processed document {process_id} (document_id: {document_id})")
+                # The tag arrays are stored verbatim, so echo them instead of reading them back
+                updated_doc = {field: tag_data[field] for field in TAG_FIELDS if field in tag_data}
+                updated_doc.update(response.data[0])
+                
+                self.logger.info("Updated tags for processed document %s (document_id: %s)", updated_doc['process_id'], document_id)
                 return updated_doc, None
             else:
-                error_msg = f"Failed to update processed document tags - no data returned"
-                self.logger.error(error_msg)
-                return None, error_msg
+                return None, f"No processed document found for document_id {document_id}"
         except Exception as e:
             error_msg = f"Failed to update document tags: {str(e)}"
             self.logger.error(error_msg)
@@ -431,22 +543,11 @@ class DatabaseService:
     def get_unprocessed_documents(self, limit: int = 1) -> tuple[List[Dict], Optional[str]]:
         """Get raw documents that haven't been processed yet"""
         try:
-            # Get all processed document IDs
-            processed_response = self.supabase.table('processed_documents').select('document_id').execute()
-            processed_ids = {doc['document_id'] for doc in processed_response.data}
-            
-            # Get all raw documents
-            raw_response = self.supabase.table('raw_documents').select("*").execute()
-            
-            # Filter out already processed documents
-            unprocessed_docs = []
-            for doc in raw_response.data:
-                if doc['document_id'] not in processed_ids:
-                    unprocessed_docs.append(doc)
-                    if len(unprocessed_docs) >= limit:
-                        break
+            # Anti-join runs in Postgres so only `limit` rows come back
+            response = self.supabase.rpc('get_unprocessed_raw_documents', {'p_limit': limit}).execute()
+            unprocessed_docs = response.data or []
             
-            self.logger.info(f"Retrieved {len(unprocessed_docs)} unprocessed documents out of {len(raw_response.data)} total raw documents")
+            self.logger.info("Retrieved %d unprocessed documents", len(unprocessed_docs))
             return unprocessed_docs, None
             
         except Exception as e:
@@ -454,68 +555,62 @@ class DatabaseService:
             self.logger.error(error_msg)
             return [], error_msg
     
-    def create_explanations(self, process_id: int, explanations: List[Dict[str, Any]]) -> Optional[str]:
-        """Create explanation records for a processed document"""
-        try:
-            explanation_records = []
-            for explanation in explanations:
-                # Build service response with SHAP data if available
-                service_response = explanation.get('full_response', {})
-                if explanation.get('shap_data'):
-                    service_response['shap_explainability'] = explanation['shap_data']
-
-                record = {
-                    'process_id': process_id,
-                    'classification_level': explanation['level'],
-                    'predicted_tag': explanation['tag'],
-                    'confidence': explanation['confidence'],
-                    'reasoning': explanation.get('reasoning'),
-                    'source_service': explanation['source'],
-                    'service_response': service_response
-                }
-                explanation_records.append(record)
-            
-            if explanation_records:
-                response = self.supabase.table('explanations').insert(explanation_records).execute()
-                if response.data:
-                    self.logger.info(f"Created {len(response.data)} explanation records for process_id {process_id}")
-                    return None
-                else:
-                    return "Failed to create explanation records - no data returned"
-            
+    @staticmethod
+    def _explanation_row(explanation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map an incoming explanation to explanations table columns (without process_id).
+
+        Each field is read once; returns None when the explanation would
+        violate the explanations table constraints.
+        """
+        level = explanation.get('level')
+        source = explanation.get('source')
+        tag = explanation.get('tag')
+        confidence = explanation.get('confidence')
+        if (
+            level not in VALID_CLASSIFICATION_LEVELS
+            or source not in VALID_EXPLANATION_SOURCES
+            or not tag
+            or not isinstance(confidence, (int, float))
+            or not 0 <= confidence <= 1
+        ):
             return None
-            
-        except Exception as e:
-            error_msg = f"Failed to create explanations: {str(e)}"
-            self.logger.error(error_msg)
-            return error_msg
+        
+        # Build service response with SHAP data if available, without mutating the caller's dict
+        service_response = explanation.get('full_response') or {}
+        shap_data = explanation.get('shap_data')
+        if shap_data:
+            service_response = {**service_response, 'shap_explainability': shap_data}
+        
+        return {
+            'classification_level': level,
+            'predicted_tag': tag,
+            'confidence': confidence,
+            'reasoning': explanation.get('reasoning'),
+            'source_service': source,
+            'service_response': service_response
+        }
+    
+    def _explanation_rows(self, explanations: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Valid explanations mapped to table rows, logging how many were skipped.
+
+        The RPCs keep one row per (process, level, source); the last one sent
+        replaces any stored row (migrations/014).
+        """
+        rows = [self._explanation_row(explanation) for explanation in explanations or []]
+        valid_rows = [row for row in rows if row is not None]
+        invalid = len(rows) - len(valid_rows)
+        if invalid:
+            self.logger.warning("Skipping %d invalid explanations", invalid)
+        return valid_rows
     
     def get_explanations_for_document(self, document_id: int) -> tuple[List[Dict], Optional[str]]:
-        """Get all explanations for a specific document by joining with processed_documents"""
+        """Get all explanations for a specific document"""
         try:
-            # Join explanations with processed_documents to get explanations by document_id
-            response = self.supabase.table('explanations').select("""
-                explanation_id,
-                process_id,
-                classification_level,
-                predicted_tag,
-                confidence,
-                reasoning,
-                source_service,
-                service_response,
-                created_at,
-                processed_documents!inner(document_id)
-            """).eq('processed_documents.document_id', document_id).order('classification_level').execute()
+            response = self._table(EXPLANATIONS_VIEW).select(EXPLANATION_COLUMNS).eq('document_id', document_id).order('classification_level').execute()
             
             if response.data:
-                # Flatten the response to remove nested processed_documents
-                explanations = []
-                for item in response.data:
-                    explanation = {k: v for k, v in item.items() if k != 'processed_documents'}
-                    explanation['document_id'] = item['processed_documents']['document_id']
-                    explanations.append(explanation)
-                
-                self.logger.info(f"Retrieved {len(explanations)} explanations for document {document_id}")
+                explanations = response.data
+                self.logger.info("Retrieved %d explanations for document %s", len(explanations), document_id)
                 return explanations, None
             else:
                 return [], None
@@ -2,8 +2,10 @@
 Test configuration and fixtures for document-service tests
 """
 import pytest
+import json
 import os
 import sys
+from typing import Dict, Optional
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -13,110 +15,129 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # Load environment variables
 load_dotenv()
 
+# Tests assert on fresh reads, so keep the listing cache off unless asked for
+os.environ.setdefault("DOCUMENT_QUERY_CACHE_TTL", "0")
+
+
+# Opt-in: keep the seed rows between runs and remember their IDs in a file,
+# skipping both the existence checks and the cleanup on later runs
+CACHE_TEST_DB = os.environ.get("CLERC_CACHE_TEST_DB") == "1"
+TEST_FIXTURE_CACHE = "/tmp/clerc_test_fixture.json"
+
+TEST_USER_DATA = {
+    "user": "test_user",
+    "api_key": "test_api_key_123"
+}
+TEST_COMPANY_DATA = {
+    "company_name": "Test Company"
+}
+TEST_MODEL_DATA = {
+    "model_name": "Test Model",
+    "version": "1.0.0",
+    "description": "Test model for integration tests",
+    "deployed_date": "2024-01-01T00:00:00Z"
+}
+
+_supabase_client: Optional[Client] = None
+_test_ids: Dict[str, int] = {}
+
+
+def _get_supabase() -> Client:
+    """Create the Supabase client once per test process"""
+    global _supabase_client
+    if _supabase_client is None:
+        _supabase_client = create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
+    return _supabase_client
+
+
+def _ensure_row(supabase: Client, table: str, id_column: str, match_column: str, data: Dict) -> int:
+    """Return the ID of the seed row matching data[match_column], creating it if missing"""
+    existing = supabase.table(table).select(id_column).eq(match_column, data[match_column]).execute()
+    if existing.data:
+        return existing.data[0][id_column]
+    
+    result = supabase.table(table).insert(data).execute()
+    row_id = result.data[0][id_column]
+    print(f"Created {table} row with {id_column}: {row_id}")
+    return row_id
+
+
+def _load_cached_ids() -> Optional[Dict[str, int]]:
+    """IDs saved by a previous run, when CLERC_CACHE_TEST_DB is enabled"""
+    if not CACHE_TEST_DB:
+        return None
+    try:
+        with open(TEST_FIXTURE_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_data():
     """Setup test data that all tests can use"""
     
-    # Initialize Supabase client
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    
-    if not supabase_url or not supabase_key:
+    if not os.environ.get("SUPABASE_URL") or not os.environ.get("SUPABASE_KEY"):
         pytest.skip("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
     
+    cached_ids = _load_cached_ids()
+    if cached_ids:
+        _test_ids.update(cached_ids)
+        yield _test_ids
+        return
+    
     try:
-        supabase: Client = create_client(supabase_url, supabase_key)
-        
-        # Create a test user in access_control table if it doesn't exist
-        test_user_data = {
-            "user": "test_user",
-            "api_key": "test_api_key_123"
-        }
-        
-        # Check if test user already exists
-        existing_user = supabase.table('access_control').select("access_id").eq('user', 'test_user').execute()
-        
-        if not existing_user.data:
-            # Create test user
-            result = supabase.table('access_control').insert(test_user_data).execute()
-            if result.data:
-                print(f"Created test user with access_id: {result.data[0]['access_id']}")
-        
-        # Create a test company if it doesn't exist
-        test_company_data = {
-            "company_name": "Test Company"
-        }
-        
-        existing_company = supabase.table('companies').select("company_id").eq('company_name', 'Test Company').execute()
+        supabase = _get_supabase()
         
-        if not existing_company.data:
-            result = supabase.table('companies').insert(test_company_data).execute()
-            if result.data:
-                print(f"Created test company with company_id: {result.data[0]['company_id']}")
-        
-        # Create a test model version if it doesn't exist
-        test_model_data = {
-            "model_name": "Test Model",
-            "version": "1.0.0",
-            "description": "Test model for integration tests",
-            "deployed_date": "2024-01-01T00:00:00Z"
-        }
-        
-        existing_model = supabase.table('model_versions').select("model_id").eq('model_name', 'Test Model').execute()
-        
-        if not existing_model.data:
-            result = supabase.table('model_versions').insert(test_model_data).execute()
-            if result.data:
-                print(f"Created test model with model_id: {result.data[0]['model_id']}")
-        
-        yield
-        
-        # Cleanup - Remove test data after all tests
-        # Note: This will cascade delete all related documents
+        # Create the test user, company and model if they don't exist
+        _test_ids["user_id"] = _ensure_row(supabase, 'access_control', 'access_id', 'user', TEST_USER_DATA)
+        _test_ids["company_id"] = _ensure_row(supabase, 'companies', 'company_id', 'company_name', TEST_COMPANY_DATA)
+        _test_ids["model_id"] = _ensure_row(supabase, 'model_versions', 'model_id', 'model_name', TEST_MODEL_DATA)
+    except Exception as e:
+        print(f"Error setting up test data: {e}")
+        pytest.skip(f"Cannot setup test environment: {e}")
+    
+    if CACHE_TEST_DB:
+        with open(TEST_FIXTURE_CACHE, "w") as f:
+            json.dump(_test_ids, f)
+    
+    yield _test_ids
+    
+    # Under pytest-xdist every worker runs this fixture, and the first
+    # one to finish would delete rows the others still use. The checks
+    # above reuse existing rows, so leave them in place for the next run.
+    # Cached rows are kept on purpose.
+    if os.environ.get("PYTEST_XDIST_WORKER") or CACHE_TEST_DB:
+        return
+    
+    # Cleanup - Remove test data after all tests
+    # Note: This will cascade delete all related documents
+    # IDs cached by an earlier CLERC_CACHE_TEST_DB run point at these rows
+    try:
+        os.remove(TEST_FIXTURE_CACHE)
+    except FileNotFoundError:
+        pass
+    try:
         supabase.table('access_control').delete().eq('user', 'test_user').execute()
         supabase.table('companies').delete().eq('company_name', 'Test Company').execute()
         supabase.table('model_versions').delete().eq('model_name', 'Test Model').execute()
-        
     except Exception as e:
-        print(f"Error setting up test data: {e}")
-        pytest.skip(f"Cannot setup test environment: {e}")
+        print(f"Error cleaning up test data: {e}")
 
 
-@pytest.fixture
-def test_user_id():
+@pytest.fixture(scope="session")
+def test_user_id(setup_test_data):
     """Get the test user ID"""
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    supabase: Client = create_client(supabase_url, supabase_key)
-    
-    result = supabase.table('access_control').select("access_id").eq('user', 'test_user').execute()
-    if result.data:
-        return result.data[0]['access_id']
-    return 1  # Fallback
+    return setup_test_data.get("user_id", 1)  # Fallback
 
 
-@pytest.fixture
-def test_company_id():
+@pytest.fixture(scope="session")
+def test_company_id(setup_test_data):
     """Get the test company ID"""
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    supabase: Client = create_client(supabase_url, supabase_key)
-    
-    result = supabase.table('companies').select("company_id").eq('company_name', 'Test Company').execute()
-    if result.data:
-        return result.data[0]['company_id']
-    return 1  # Fallback
+    return setup_test_data.get("company_id", 1)  # Fallback
 
 
-@pytest.fixture
-def test_model_id():
+@pytest.fixture(scope="session")
+def test_model_id(setup_test_data):
     """Get the test model ID"""
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    supabase: Client = create_client(supabase_url, supabase_key)
-    
-    result = supabase.table('model_versions').select("model_id").eq('model_name', 'Test Model').execute()
-    if result.data:
-        return result.data[0]['model_id']
-    return 1  # Fallback
\ No newline at end of file
+    return setup_test_data.get("model_id", 1)  # Fallback
@@ -0,0 +1,63 @@
+"""
+Fixtures for document-service end-to-end tests
+"""
+import os
+import pytest
+import requests
+
+BASE_URL = os.environ.get('SERVICE_URL', 'http://localhost:5002')
+
+
+def _warmup(session):
+    """Open the pooled connection up front so the first test doesn't pay for it"""
+    try:
+        session.get(f"{BASE_URL}/e2e", timeout=2)
+    except requests.RequestException:
+        pass  # The availability tests report an unreachable service
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_data():
+    """E2E tests only talk to the running service over HTTP.
+
+    Overrides the Supabase seed-data fixture in tests/conftest.py, so E2E runs
+    neither need SUPABASE_URL/SUPABASE_KEY (and silently skip without them)
+    nor create and delete seed rows.
+    """
+    yield {}
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """One keep-alive session shared by every E2E test on this worker.
+
+    requests.Session is not guaranteed thread-safe, so tests that fan out
+    over threads should not pass it to their workers.
+    """
+    session = requests.Session()
+    # json= bodies already set Content-Type; only the response format is fixed here
+    session.headers.update({'Accept': 'application/json'})
+    _warmup(session)
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def created_documents(http_session):
+    """IDs of documents a test created; each is deleted after the test"""
+    document_ids = []
+    yield document_ids
+    for doc_id in document_ids:
+        try:
+            http_session.delete(f"{BASE_URL}/documents/{doc_id}")
+        except requests.RequestException:
+            pass  # Ignore cleanup errors
+
+
+@pytest.fixture(autouse=True)
+def _e2e_test_state(request, http_session, created_documents):
+    """Expose base_url, session and created_documents on E2E test classes"""
+    if request.instance is not None:
+        request.instance.base_url = BASE_URL
+        request.instance.session = http_session
+        request.instance.created_documents = created_documents
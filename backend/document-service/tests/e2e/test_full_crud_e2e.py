@@ -1,31 +1,25 @@
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-BASE_URL = "http://localhost:5002"
+def listed_documents(data):
+    """Documents from a GET /documents body ({documents, pagination} or a bare list)"""
+    payload = data["data"]
+    return payload["documents"] if "documents" in payload else payload
+
+def document_name(doc):
+    """Document name; processed documents nest it under raw_documents"""
+    return doc["raw_documents"]["document_name"] if "raw_documents" in doc else doc["document_name"]
 
 class TestDocumentServiceE2E:
     """End-to-end tests for Document Service via HTTP requests"""
     
-    def setup_method(self):
-        """Setup for each test method"""
-        self.base_url = BASE_URL
-        self.created_documents = []
-    
-    def teardown_method(self):
-        """Cleanup after each test method"""
-        # Clean up any documents created during testing
-        for doc_id in self.created_documents:
-            try:
-                requests.delete(f"{self.base_url}/documents/{doc_id}")
-            except:
-                pass  # Ignore cleanup errors
-    
     def test_service_availability(self):
         """Test that the service is running and accessible"""
         print("\n[TEST] Testing service availability...")
         
-        response = requests.get(f"{self.base_url}/e2e")
+        response = self.session.get(f"{self.base_url}/e2e")
         
         assert response.status_code == 200
         data = response.json()
@@ -38,7 +32,7 @@ class TestDocumentServiceE2E:
         """Test health check endpoint"""
         print("\n[TEST] Testing health check endpoint...")
         
-        response = requests.get(f"{self.base_url}/health")
+        response = self.session.get(f"{self.base_url}/health")
         
         # Health check can return 200 (healthy) or 503 (unhealthy)
         assert response.status_code in [200, 503]
@@ -62,10 +56,9 @@ class TestDocumentServiceE2E:
             "uploaded_by": 6,
         }
         
-        create_response = requests.post(
+        create_response = self.session.post(
             f"{self.base_url}/documents",
-            json=create_data,
-            headers={'Content-Type': 'application/json'}
+            json=create_data
         )
         
         assert create_response.status_code == 201
@@ -80,17 +73,13 @@ class TestDocumentServiceE2E:
         
         # 2. READ the document
         print("  [STEP 2] Reading document...")
-        read_response = requests.get(f"{self.base_url}/documents/{document_id}")
+        read_response = self.session.get(f"{self.base_url}/documents/{document_id}")
         
         assert read_response.status_code == 200
         read_result = read_response.json()
         assert read_result["status"] == "success"
         assert read_result["data"]["document_id"] == document_id
-        # For processed documents, document_name is in raw_documents sub-object
-        if "raw_documents" in read_result["data"]:
-            assert read_result["data"]["raw_documents"]["document_name"] == "E2E Test Document"
-        else:
-            assert read_result["data"]["document_name"] == "E2E Test Document"
+        assert document_name(read_result["data"]) == "E2E Test Document"
         
         print("  [PASS] Document read successfully")
         
@@ -103,26 +92,21 @@ class TestDocumentServiceE2E:
             "uploaded_by": 6,
         }
         
-        update_response = requests.put(
+        update_response = self.session.put(
             f"{self.base_url}/documents/{document_id}",
-            json=update_data,
-            headers={'Content-Type': 'application/json'}
+            json=update_data
         )
         
         assert update_response.status_code == 200
         update_result = update_response.json()
         assert update_result["status"] == "success"
-        # For processed documents, document_name is in raw_documents sub-object
-        if "raw_documents" in update_result["data"]:
-            assert update_result["data"]["raw_documents"]["document_name"] == "E2E Test Document Updated"
-        else:
-            assert update_result["data"]["document_name"] == "E2E Test Document Updated"
+        assert document_name(update_result["data"]) == "E2E Test Document Updated"
         
         print("  [PASS] Document updated successfully")
         
         # 4. DELETE the document
         print("  [STEP 4] Deleting document...")
-        delete_response = requests.delete(f"{self.base_url}/documents/{document_id}")
+        delete_response = self.session.delete(f"{self.base_url}/documents/{document_id}")
         
         assert delete_response.status_code == 200
         delete_result = delete_response.json()
@@ -130,7 +114,7 @@ class TestDocumentServiceE2E:
         assert delete_result["message"] == "Document deleted successfully"
         
         # Verify deletion
-        verify_response = requests.get(f"{self.base_url}/documents/{document_id}")
+        verify_response = self.session.get(f"{self.base_url}/documents/{document_id}")
         assert verify_response.status_code == 404
         
         print("  [PASS] Document deleted successfully")
@@ -141,44 +125,31 @@ class TestDocumentServiceE2E:
         print("\n[TEST] Testing document listing functionality...")
         
         # Test basic listing
-        response = requests.get(f"{self.base_url}/documents")
+        response = self.session.get(f"{self.base_url}/documents")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "success"
-        # API returns {documents: [], pagination: {}} structure
-        if "documents" in data["data"]:
-            assert isinstance(data["data"]["documents"], list)
-        else:
-            assert isinstance(data["data"], list)
+        assert isinstance(listed_documents(data), list)
         
         print("  [PASS] Basic document listing works")
         
         # Test with pagination
-        response = requests.get(f"{self.base_url}/documents?limit=5&offset=0")
+        response = self.session.get(f"{self.base_url}/documents?limit=5&offset=0")
         assert response.status_code == 200
         data = response.json()
-        # Check the correct data structure
-        if "documents" in data["data"]:
-            assert len(data["data"]["documents"]) <= 5
-        else:
-            assert len(data["data"]) <= 5
+        assert len(listed_documents(data)) <= 5
         
         print("  [PASS] Pagination works")
         
         # Test with search - skip if search functionality has issues
         try:
-            response = requests.get(f"{self.base_url}/documents?search=Financial")
+            response = self.session.get(f"{self.base_url}/documents?search=Financial")
             if response.status_code == 200:
                 data = response.json()
                 
                 # All returned documents should contain "Financial" in the name
-                documents = data["data"]["documents"] if "documents" in data["data"] else data["data"]
-                for doc in documents:
-                    # For processed documents, document_name is in raw_documents
-                    if "raw_documents" in doc:
-                        assert "financial" in doc["raw_documents"]["document_name"].lower()
-                    else:
-                        assert "financial" in doc["document_name"].lower()
+                for doc in listed_documents(data):
+                    assert "financial" in document_name(doc).lower()
                 print("  [PASS] Search functionality works")
             else:
                 print("  [SKIP] Search functionality has issues - needs database service fix")
@@ -192,7 +163,7 @@ class TestDocumentServiceE2E:
         print("\n[TEST] Testing error handling scenarios...")
         
         # Test 404 for non-existent document
-        response = requests.get(f"{self.base_url}/documents/99999")
+        response = self.session.get(f"{self.base_url}/documents/99999")
         assert response.status_code == 404
         data = response.json()
         assert data["status"] == "error"
@@ -202,10 +173,9 @@ class TestDocumentServiceE2E:
         
         # Test validation error for missing fields
         invalid_data = {"document_name": "Test"}  # Missing required fields
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/documents",
-            json=invalid_data,
-            headers={'Content-Type': 'application/json'}
+            json=invalid_data
         )
         assert response.status_code == 400
         data = response.json()
@@ -214,7 +184,7 @@ class TestDocumentServiceE2E:
         print("  [PASS] Validation error handling works")
         
         # Test invalid JSON
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/documents",
             data="invalid json",
             headers={'Content-Type': 'application/json'}
@@ -225,7 +195,7 @@ class TestDocumentServiceE2E:
         print("  [PASS] Invalid JSON error handling works")
         
         # Test method not allowed
-        response = requests.patch(f"{self.base_url}/documents")
+        response = self.session.patch(f"{self.base_url}/documents")
         assert response.status_code == 405
         
         print("  [PASS] Method not allowed error handling works")
@@ -235,11 +205,6 @@ class TestDocumentServiceE2E:
         """Test concurrent document operations"""
         print("\n[TEST] Testing concurrent operations...")
         
-        import threading
-        import queue
-        
-        results = queue.Queue()
-        
         def create_document(name_suffix):
             """Helper function to create a document"""
             data = {
@@ -249,29 +214,21 @@ class TestDocumentServiceE2E:
                 "uploaded_by": 6,
             }
             
+            # Plain requests, not the shared session (see http_session)
             response = requests.post(
                 f"{self.base_url}/documents",
-                json=data,
-                headers={'Content-Type': 'application/json'}
+                json=data
             )
             
-            results.put((name_suffix, response.status_code, response.json()))
+            return response.status_code, response.json()
         
         # Create multiple documents concurrently
-        threads = []
-        for i in range(3):
-            thread = threading.Thread(target=create_document, args=(i,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(create_document, range(3)))
         
         # Check results
         created_docs = []
-        while not results.empty():
-            suffix, status_code, data = results.get()
+        for status_code, data in results:
             assert status_code == 201
             assert data["status"] == "success"
             created_docs.append(data["data"]["document_id"])
@@ -292,8 +249,17 @@ class TestDocumentServiceE2E:
             ("GET", "/documents", None),
         ]
         
-        for method, endpoint, data in endpoints_to_test:
-            response = requests.request(method, f"{self.base_url}{endpoint}", json=data)
+        # The probes are independent reads, so overlap their round-trips;
+        # map() keeps the responses in endpoint order. Plain requests, not the
+        # shared session (see http_session).
+        def send(spec):
+            method, endpoint, data = spec
+            return requests.request(method, f"{self.base_url}{endpoint}", json=data)
+        
+        with ThreadPoolExecutor(max_workers=len(endpoints_to_test)) as executor:
+            responses = list(executor.map(send, endpoints_to_test))
+        
+        for (method, endpoint, _), response in zip(endpoints_to_test, responses):
             response_data = response.json()
             
             # Check required fields
@@ -307,45 +273,3 @@ class TestDocumentServiceE2E:
             print(f"  [PASS] {method} {endpoint} response format is consistent")
         
         print("[SUCCESS] API response consistency test completed")
-
-def run_all_tests():
-    """Run all E2E tests"""
-    print("="*60)
-    print("STARTING END-TO-END TESTS FOR DOCUMENT SERVICE")
-    print("="*60)
-    
-    test_suite = TestDocumentServiceE2E()
-    
-    tests = [
-        test_suite.test_service_availability,
-        test_suite.test_health_check,
-        test_suite.test_full_document_lifecycle,
-        test_suite.test_list_documents_functionality,
-        test_suite.test_error_handling,
-        test_suite.test_concurrent_operations,
-        test_suite.test_api_response_consistency,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test_suite.setup_method()
-            test()
-            test_suite.teardown_method()
-            passed += 1
-        except Exception as e:
-            print(f"[FAIL] {test.__name__} failed: {e}")
-            failed += 1
-            test_suite.teardown_method()
-    
-    print("="*60)
-    print(f"TEST RESULTS: {passed} passed, {failed} failed")
-    print("="*60)
-    
-    return failed == 0
-
-if __name__ == "__main__":
-    success = run_all_tests()
-    exit(0 if success else 1)
\ No newline at end of file
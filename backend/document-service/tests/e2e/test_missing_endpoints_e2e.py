@@ -1,31 +1,13 @@
-import requests
 import json
-import os
-
-BASE_URL = os.environ.get('SERVICE_URL', 'http://localhost:5002')
 
 class TestMissingEndpointsE2E:
     """End-to-end tests for previously untested endpoints"""
     
-    def setup_method(self):
-        """Setup for each test method"""
-        self.base_url = BASE_URL
-        self.created_documents = []
-    
-    def teardown_method(self):
-        """Cleanup after each test method"""
-        # Clean up any documents created during testing
-        for doc_id in self.created_documents:
-            try:
-                requests.delete(f"{self.base_url}/documents/{doc_id}")
-            except:
-                pass  # Ignore cleanup errors
-    
     def test_root_endpoint_e2e(self):
         """Test the root endpoint GET / via HTTP"""
         print("\n[TEST] Testing root endpoint via HTTP...")
         
-        response = requests.get(f"{self.base_url}/")
+        response = self.session.get(f"{self.base_url}/")
         
         assert response.status_code == 200
         data = response.json()
@@ -65,10 +47,9 @@ class TestMissingEndpointsE2E:
             "uploaded_by": 6,
         }
         
-        create_response = requests.post(
+        create_response = self.session.post(
             f"{self.base_url}/documents",
-            json=create_data,
-            headers={'Content-Type': 'application/json'}
+            json=create_data
         )
         
         assert create_response.status_code == 201
@@ -80,10 +61,9 @@ class TestMissingEndpointsE2E:
         print("  [STEP 2] Updating status to 'processing'...")
         status_data = {"status": "processing"}
         
-        status_response = requests.patch(
+        status_response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/status",
-            json=status_data,
-            headers={'Content-Type': 'application/json'}
+            json=status_data
         )
         
         if status_response.status_code != 200:
@@ -100,10 +80,9 @@ class TestMissingEndpointsE2E:
         print("  [STEP 3] Updating status to 'processed'...")
         status_data = {"status": "processed"}
         
-        status_response = requests.patch(
+        status_response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/status",
-            json=status_data,
-            headers={'Content-Type': 'application/json'}
+            json=status_data
         )
         
         if status_response.status_code != 200:
@@ -126,10 +105,9 @@ class TestMissingEndpointsE2E:
         print("  [SCENARIO 1] Testing update status for non-existent document...")
         status_data = {"status": "processing"}
         
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/99999/status",
-            json=status_data,
-            headers={'Content-Type': 'application/json'}
+            json=status_data
         )
         
         assert response.status_code == 404
@@ -140,10 +118,9 @@ class TestMissingEndpointsE2E:
         
         # Test 2: Missing status field
         print("  [SCENARIO 2] Testing update with missing status field...")
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/1/status",
-            json={},  # Empty payload
-            headers={'Content-Type': 'application/json'}
+            json={}  # Empty payload
         )
         
         assert response.status_code == 400
@@ -154,10 +131,9 @@ class TestMissingEndpointsE2E:
         
         # Test 3: Invalid status data type
         print("  [SCENARIO 3] Testing update with invalid status data type...")
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/1/status",
-            json={"status": 123},  # Should be string
-            headers={'Content-Type': 'application/json'}
+            json={"status": 123}  # Should be string
         )
         
         assert response.status_code == 400
@@ -168,7 +144,7 @@ class TestMissingEndpointsE2E:
         
         # Test 4: Invalid JSON
         print("  [SCENARIO 4] Testing update with invalid JSON...")
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/1/status",
             data="invalid json",
             headers={'Content-Type': 'application/json'}
@@ -181,23 +157,3 @@ class TestMissingEndpointsE2E:
         print("  [PASS] Error returned for invalid JSON")
         
         print("[SUCCESS] Document status update error scenarios completed successfully")
-
-
-if __name__ == "__main__":
-    test_instance = TestMissingEndpointsE2E()
-    
-    # Run each test method
-    test_methods = [
-        test_instance.test_root_endpoint_e2e,
-        test_instance.test_update_document_status_lifecycle_e2e,
-        test_instance.test_update_document_status_error_scenarios_e2e
-    ]
-    
-    for test_method in test_methods:
-        try:
-            test_instance.setup_method()
-            test_method()
-        finally:
-            test_instance.teardown_method()
-    
-    print("\n🎉 ALL MISSING ENDPOINTS E2E TESTS PASSED!")
\ No newline at end of file
@@ -4,25 +4,9 @@ import time
 import threading
 from typing import List, Dict, Any
 
-BASE_URL = "http://localhost:5002"
-
 class TestTagOperationsE2E:
     """End-to-end tests for tag operations via HTTP requests"""
     
-    def setup_method(self):
-        """Setup for each test method"""
-        self.base_url = BASE_URL
-        self.created_documents = []
-    
-    def teardown_method(self):
-        """Cleanup after each test method"""
-        # Clean up any documents created during testing
-        for doc_id in self.created_documents:
-            try:
-                requests.delete(f"{self.base_url}/documents/{doc_id}")
-            except:
-                pass  # Ignore cleanup errors
-    
     def create_test_document_with_processing(self, name_suffix: str = "") -> Dict[str, Any]:
         """Helper method to create a document with processed entry"""
         # Create raw document
@@ -33,7 +17,7 @@ class TestTagOperationsE2E:
             "uploaded_by": 6,
         }
         
-        raw_response = requests.post(
+        raw_response = self.session.post(
             f"{self.base_url}/documents",
             json=raw_doc_data,
             headers={'Content-Type': 'application/json'}
@@ -57,7 +41,7 @@ class TestTagOperationsE2E:
             "processing_ms": 1500
         }
         
-        processed_response = requests.post(
+        processed_response = self.session.post(
             f"{self.base_url}/documents/processed",
             json=processed_data,
             headers={'Content-Type': 'application/json'}
@@ -76,7 +60,7 @@ class TestTagOperationsE2E:
         print("\n[TEST] Testing tag update endpoint availability...")
         
         # First check if the service has the tag endpoints
-        root_response = requests.get(f"{self.base_url}/")
+        root_response = self.session.get(f"{self.base_url}/")
         if root_response.status_code == 200:
             root_data = root_response.json()
             endpoints = root_data.get("data", {}).get("endpoints", [])
@@ -97,7 +81,7 @@ class TestTagOperationsE2E:
             "confirmed_tags": ["invoice"]
         }
         
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json=tag_data,
             headers={'Content-Type': 'application/json'}
@@ -122,7 +106,7 @@ class TestTagOperationsE2E:
         # Step 2: Retrieve document to see AI suggestions from processed documents
         print("  [STEP 2] Retrieving document to view AI suggestions...")
         # Query processed documents, filtering by document_id
-        get_response = requests.get(f"{self.base_url}/documents")
+        get_response = self.session.get(f"{self.base_url}/documents")
         assert get_response.status_code == 200
         
         # Find our created document in the processed documents
@@ -150,7 +134,7 @@ class TestTagOperationsE2E:
             "user_added_labels": ["client-abc", "priority-high", "q1-2024"]  # Custom tags
         }
         
-        update_response = requests.patch(
+        update_response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json=tag_update_data,
             headers={'Content-Type': 'application/json'}
@@ -171,7 +155,7 @@ class TestTagOperationsE2E:
             "user_added_labels": ["client-abc", "priority-medium", "q1-2024", "reviewed"]  # Modified priority, added reviewed
         }
         
-        modify_response = requests.patch(
+        modify_response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json=modified_tag_data,
             headers={'Content-Type': 'application/json'}
@@ -187,7 +171,7 @@ class TestTagOperationsE2E:
         # Step 5: Final verification
         print("  [STEP 5] Final verification of tag state...")
         # Query processed documents again to verify final state
-        final_response = requests.get(f"{self.base_url}/documents")
+        final_response = self.session.get(f"{self.base_url}/documents")
         assert final_response.status_code == 200
         
         # Find our document in processed documents
@@ -229,6 +213,7 @@ class TestTagOperationsE2E:
                     "user_added_labels": [f"concurrent-tag-{tag_suffix}", f"thread-{tag_suffix}"]
                 }
                 
+                # Plain requests, not the shared session (see http_session)
                 response = requests.patch(
                     f"{self.base_url}/documents/{document_id}/tags",
                     json=tag_data,
@@ -280,7 +265,7 @@ class TestTagOperationsE2E:
             "user_added_labels": []
         }
         
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json=empty_data,
             headers={'Content-Type': 'application/json'}
@@ -316,7 +301,7 @@ class TestTagOperationsE2E:
             ]
         }
         
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json=special_data,
             headers={'Content-Type': 'application/json'}
@@ -334,7 +319,7 @@ class TestTagOperationsE2E:
             "user_added_labels": [long_tag, "normal-tag"]
         }
         
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json=long_data,
             headers={'Content-Type': 'application/json'}
@@ -359,7 +344,7 @@ class TestTagOperationsE2E:
             ]
         }
         
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json=unicode_data,
             headers={'Content-Type': 'application/json'}
@@ -378,7 +363,7 @@ class TestTagOperationsE2E:
         
         # Test 1: Non-existent document
         print("  [ERROR SCENARIO 1] Non-existent document...")
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/99999/tags",
             json={"confirmed_tags": ["test"]},
             headers={'Content-Type': 'application/json'}
@@ -393,7 +378,7 @@ class TestTagOperationsE2E:
         doc_info = self.create_test_document_with_processing("error-test")
         document_id = doc_info["document_id"]
         
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             data="invalid json",
             headers={'Content-Type': 'application/json'}
@@ -404,7 +389,7 @@ class TestTagOperationsE2E:
         
         # Test 3: Missing required fields
         print("  [ERROR SCENARIO 3] Missing required tag fields...")
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json={"some_other_field": "value"},
             headers={'Content-Type': 'application/json'}
@@ -416,7 +401,7 @@ class TestTagOperationsE2E:
         
         # Test 4: Invalid data types
         print("  [ERROR SCENARIO 4] Invalid data types...")
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json={
                 "confirmed_tags": "not-an-array",
@@ -431,7 +416,7 @@ class TestTagOperationsE2E:
         
         # Test 5: Empty request body
         print("  [ERROR SCENARIO 5] Empty request body...")
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json={},
             headers={'Content-Type': 'application/json'}
@@ -454,7 +439,7 @@ class TestTagOperationsE2E:
         many_tags = [f"tag-{i}" for i in range(100)]  # 100 tags
         
         start_time = time.time()
-        response = requests.patch(
+        response = self.session.patch(
             f"{self.base_url}/documents/{document_id}/tags",
             json={"user_added_labels": many_tags},
             headers={'Content-Type': 'application/json'}
@@ -491,7 +476,7 @@ class TestTagOperationsE2E:
             print(f"  [OPERATION {i+1}] Applying operation {i+1}...")
             
             # Apply operation
-            response = requests.patch(
+            response = self.session.patch(
                 f"{self.base_url}/documents/{document_id}/tags",
                 json=operation,
                 headers={'Content-Type': 'application/json'}
@@ -505,7 +490,7 @@ class TestTagOperationsE2E:
             assert set(result["user_added_labels"]) == set(operation["user_added_labels"])
             
             # Verify by retrieving the document from processed documents
-            get_response = requests.get(f"{self.base_url}/documents")
+            get_response = self.session.get(f"{self.base_url}/documents")
             assert get_response.status_code == 200
             
             # Find our document
@@ -525,72 +510,3 @@ class TestTagOperationsE2E:
         
         print("  [PASS] Data consistency maintained across all operations")
         print("[SUCCESS] Tag data consistency test completed")
-
-    def check_tag_endpoints_available(self):
-        """Check if tag endpoints are available in the running service"""
-        try:
-            root_response = requests.get(f"{self.base_url}/")
-            if root_response.status_code == 200:
-                root_data = root_response.json()
-                endpoints = root_data.get("data", {}).get("endpoints", [])
-                return any("tags" in endpoint for endpoint in endpoints)
-        except:
-            pass
-        return False
-
-def run_all_tag_e2e_tests():
-    """Run all tag-related E2E tests"""
-    print("="*80)
-    print("STARTING END-TO-END TESTS FOR TAG OPERATIONS")
-    print("="*80)
-    
-    test_suite = TestTagOperationsE2E()
-    test_suite.setup_method()
-    
-    # Check if tag endpoints are available
-    if not test_suite.check_tag_endpoints_available():
-        print("⚠️  [SKIP] Tag update endpoints not available in running service")
-        print("   The service needs to be restarted to pick up the new tag functionality")
-        print("   To test tag operations:")
-        print("   1. Stop the current service")
-        print("   2. Restart with: cd ../.. && python app.py")
-        print("   3. Run tag tests again")
-        print("")
-        print("="*80)
-        print("TAG E2E TEST RESULTS: 0 passed, 0 failed (SKIPPED - Service restart needed)")
-        print("="*80)
-        return True  # Don't fail the test suite, just skip
-    
-    tests = [
-        test_suite.test_tag_update_endpoint_availability,
-        test_suite.test_full_tag_management_workflow,
-        test_suite.test_concurrent_tag_operations,
-        test_suite.test_tag_operations_with_various_data_types,
-        test_suite.test_tag_operations_error_scenarios,
-        test_suite.test_tag_operations_performance,
-        test_suite.test_tag_data_consistency_across_operations,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            test_suite.setup_method()
-            test()
-            test_suite.teardown_method()
-            passed += 1
-        except Exception as e:
-            print(f"[FAIL] {test.__name__} failed: {e}")
-            failed += 1
-            test_suite.teardown_method()
-    
-    print("="*80)
-    print(f"TAG E2E TEST RESULTS: {passed} passed, {failed} failed")
-    print("="*80)
-    
-    return failed == 0
-
-if __name__ == "__main__":
-    success = run_all_tag_e2e_tests()
-    exit(0 if success else 1)
\ No newline at end of file
@@ -9,6 +9,13 @@ import sys
 import os
 import argparse
 
+E2E_TEST_FILES = [
+    "e2e/test_e2e.py",
+    "e2e/test_full_crud_e2e.py",
+    "e2e/test_missing_endpoints_e2e.py",
+    "e2e/test_tag_operations_e2e.py",
+]
+
 def run_command(command, description):
     """Run a command and return success status"""
     print(f"\n{'='*60}")
@@ -33,6 +40,8 @@ def main():
                        help='Verbose output')
     parser.add_argument('--service-url', default='http://localhost:5002',
                        help='Service URL for E2E tests')
+    parser.add_argument('--workers', '-n', default='auto',
+                       help='pytest-xdist worker count for E2E tests')
     
     args = parser.parse_args()
     
@@ -97,24 +106,20 @@ def main():
         # Set service URL environment variable
         os.environ['SERVICE_URL'] = args.service_url
         
-        # Run basic E2E tests
-        total_count += 1
-        if run_command("python e2e/test_e2e.py", "Basic E2E Tests"):
-            success_count += 1
-        
-        # Run comprehensive E2E tests
-        total_count += 1
-        if run_command("python e2e/test_full_crud_e2e.py", "Full CRUD E2E Tests"):
-            success_count += 1
-        
-        # Run missing endpoints E2E tests
-        total_count += 1
-        if run_command("python e2e/test_missing_endpoints_e2e.py", "Missing Endpoints E2E Tests"):
-            success_count += 1
+        # E2E files are independent and I/O bound, so run them in parallel
+        # workers. loadfile keeps each file's tests (and their shared
+        # setup/teardown state) on one worker.
+        try:
+            import xdist
+            parallel = f" -n {args.workers} --dist loadfile"
+        except ImportError:
+            print("  [INFO] pytest-xdist not available - running E2E tests serially")
+            print("         Install pytest-xdist: pip install pytest-xdist")
+            parallel = ""
         
-        # Run tag operations E2E tests
         total_count += 1
-        if run_command("python e2e/test_tag_operations_e2e.py", "Tag Operations E2E Tests"):
+        e2e_files = " ".join(E2E_TEST_FILES)
+        if run_command(f"python -m pytest {e2e_files}{parallel} -v", "E2E Tests"):
             success_count += 1
     
     # Summary
@@ -76,7 +76,7 @@ if curl -s http://localhost:5002/health > /dev/null 2>&1; then
     # Check if tag endpoints are available
     if curl -s http://localhost:5002/ | grep -q "tags"; then
         echo "✅ Tag endpoints are available"
-        run_test "Tag Operations E2E Tests" "python e2e/test_tag_operations_e2e.py"
+        run_test "Tag Operations E2E Tests" "python -m pytest e2e/test_tag_operations_e2e.py -v"
     else
         echo -e "${YELLOW}⚠️  Tag endpoints not available in running service${NC}"
         echo "The service needs to be restarted to pick up the new tag functionality"
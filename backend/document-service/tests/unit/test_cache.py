@@ -0,0 +1,54 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+# Add the parent directories to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from services.cache import TTLCache, make_key
+
+class TestTTLCache:
+    """Unit tests for the in-process TTL cache"""
+
+    def test_get_returns_value_before_expiry(self):
+        """Stored values are returned until their TTL passes"""
+        cache = TTLCache(ttl=10)
+        cache.set("k", [1, 2])
+
+        assert cache.get("k") == [1, 2]
+
+    def test_expired_entry_is_dropped(self):
+        """Entries past their TTL behave as missing"""
+        cache = TTLCache(ttl=10)
+        with patch('services.cache.time.monotonic', return_value=100.0):
+            cache.set("k", "v")
+        with patch('services.cache.time.monotonic', return_value=111.0):
+            assert cache.get("k") is None
+
+    def test_oldest_entry_evicted_when_full(self):
+        """maxsize bounds memory by evicting the oldest key"""
+        cache = TTLCache(ttl=10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+
+    def test_make_key_is_order_independent_for_kwargs(self):
+        """Keyword order does not change the canonical key"""
+        assert make_key("f", limit=5, offset=0) == make_key("f", offset=0, limit=5)
+        assert make_key("f", 1) != make_key("f", 2)
+
+    def test_set_after_clear_is_dropped_for_old_generation(self):
+        """A value read before clear() cannot repopulate the cache"""
+        cache = TTLCache(ttl=10)
+        generation = cache.generation
+        cache.clear()
+        cache.set("k", "stale", generation=generation)
+
+        assert cache.get("k") is None
+
+        cache.set("k", "fresh", generation=cache.generation)
+        assert cache.get("k") == "fresh"
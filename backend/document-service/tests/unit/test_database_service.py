@@ -0,0 +1,365 @@
+import pytest
+import logging
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add the parent directories to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from postgrest.exceptions import APIError
+from services.cache import TTLCache
+from services.database import DatabaseService, LISTING_VIEW, INVALID_STATUS_MESSAGE, MAX_CACHED_ROWS, MAX_LISTING_ROWS
+
+@pytest.fixture
+def db():
+    """DatabaseService with a mocked Supabase client (no network)"""
+    service = DatabaseService.__new__(DatabaseService)
+    service.logger = logging.getLogger(__name__)
+    service.supabase = MagicMock()
+    service._tables = {}
+    return service
+
+def view_row(**overrides):
+    """A flat processed_documents_with_raw row"""
+    row = {
+        "process_id": 1,
+        "document_id": 10,
+        "status": "api_processed",
+        "company": None,
+        "document_name": "Q3 Report.pdf",
+        "document_type": "PDF",
+        "link": "https://example.com/q3.pdf",
+        "uploaded_by": None,
+        "upload_date": "2025-01-01T00:00:00+00:00",
+        "file_size": 1024,
+        "file_hash": "abc",
+        "raw_status": "uploaded",
+    }
+    row.update(overrides)
+    return row
+
+class TestListingView:
+    """Unit tests for listing queries against the flat view"""
+
+    def test_nest_raw_documents_restores_api_shape(self):
+        """Flat view columns are nested back under raw_documents"""
+        rows = DatabaseService._nest_raw_documents([view_row()])
+
+        assert rows[0]["raw_documents"]["document_name"] == "Q3 Report.pdf"
+        assert rows[0]["raw_documents"]["status"] == "uploaded"
+        assert rows[0]["status"] == "api_processed"
+        assert "document_name" not in rows[0]
+        assert "raw_status" not in rows[0]
+
+    def test_nest_raw_documents_missing_raw_is_none(self):
+        """Rows without a raw document keep raw_documents as None"""
+        rows = DatabaseService._nest_raw_documents([view_row(document_name=None)])
+
+        assert rows[0]["raw_documents"] is None
+
+    def test_nest_raw_documents_uses_joined_company_name(self):
+        """The view's company_name is exposed as raw_documents.companies"""
+        rows = DatabaseService._nest_raw_documents([view_row(company=3, company_name="Acme")])
+
+        assert rows[0]["raw_documents"]["companies"] == {"company_id": 3, "company_name": "Acme"}
+        assert "company_name" not in rows[0]
+
+    def test_search_filters_on_view_column(self, db):
+        """Search pushes the name filter to the view instead of Python"""
+        query = db.supabase.table.return_value.select.return_value
+        query.ilike.return_value.order.return_value.limit.return_value.execute.return_value.data = [view_row()]
+
+        documents, error = db.search_documents("report", limit=5)
+
+        assert error is None
+        assert documents[0]["raw_documents"]["document_name"] == "Q3 Report.pdf"
+        db.supabase.table.assert_called_with(LISTING_VIEW)
+        query.ilike.assert_called_once_with("document_name", "%report%")
+
+    def test_search_wildcards_match_literally(self, db):
+        """%, _ and \\ in the term are escaped; the count uses the same pattern"""
+        query = db.supabase.table.return_value.select.return_value
+        query.ilike.return_value.order.return_value.limit.return_value.execute.return_value.data = []
+        query.ilike.return_value.execute.return_value.count = 0
+
+        db.search_documents("Q3_report 100%\\", limit=5)
+        db.get_total_documents_count(search="Q3_report 100%\\")
+
+        expected = "%Q3\\_report 100\\%\\\\%"
+        assert [c.args for c in query.ilike.call_args_list] == [("document_name", expected)] * 2
+
+class TestExplanationRows:
+    """Unit tests for validating explanations before they are written"""
+
+    def test_invalid_explanations_are_skipped(self, db):
+        """Rows that would violate the table constraints never leave the service"""
+        explanations = [
+            {"level": "primary", "tag": "Finance", "confidence": 0.9, "source": "ai"},
+            {"level": "quaternary", "tag": "Finance", "confidence": 0.9, "source": "ai"},
+            {"level": "primary", "tag": "Finance", "confidence": 1.5, "source": "llm"},
+        ]
+
+        rows = db._explanation_rows(explanations)
+
+        assert len(rows) == 1
+        assert rows[0]["classification_level"] == "primary"
+
+    def test_missing_explanations_are_empty(self, db):
+        """No explanations, or none valid, means nothing to send"""
+        assert db._explanation_rows(None) == []
+        assert db._explanation_rows([{"level": "unknown"}]) == []
+
+class TestUnprocessedDocuments:
+    """Unit tests for the unprocessed-documents lookup"""
+
+    def test_uses_anti_join_rpc(self, db):
+        """Only the requested rows are fetched, via the anti-join function"""
+        db.supabase.rpc.return_value.execute.return_value.data = [{"document_id": 5}]
+
+        documents, error = db.get_unprocessed_documents(limit=1)
+
+        assert error is None
+        assert documents == [{"document_id": 5}]
+        db.supabase.rpc.assert_called_once_with("get_unprocessed_raw_documents", {"p_limit": 1})
+        db.supabase.table.assert_not_called()
+
+class TestUpdateDocumentTags:
+    """Unit tests for the tag update write"""
+
+    def test_returns_metadata_with_written_tags(self, db):
+        """One RPC call; the written tag arrays are echoed over the returned metadata"""
+        db.supabase.rpc.return_value.execute.return_value.data = [{"process_id": 3, "document_id": 10, "user_reviewed": True}]
+
+        document, error = db.update_document_tags(10, {"confirmed_tags": ["invoice"]})
+
+        assert error is None
+        assert document == {"confirmed_tags": ["invoice"], "process_id": 3, "document_id": 10, "user_reviewed": True}
+        db.supabase.rpc.assert_called_once_with("update_processed_tags", {"p_document_id": 10, "p_confirmed": ["invoice"]})
+        db.supabase.table.assert_not_called()
+
+    def test_explanations_sent_with_update(self, db):
+        """Valid explanations travel in the same RPC as the tag update"""
+        db.supabase.rpc.return_value.execute.return_value.data = [{"process_id": 3}]
+        explanations = [
+            {"level": "primary", "tag": "Finance", "confidence": 0.9, "source": "ai"},
+            {"level": "unknown", "tag": "Finance", "confidence": 0.9, "source": "ai"},
+        ]
+
+        document, error = db.update_document_tags(10, {"confirmed_tags": ["invoice"], "explanations": explanations})
+
+        assert error is None
+        params = db.supabase.rpc.call_args.args[1]
+        assert [row["classification_level"] for row in params["p_explanations"]] == ["primary"]
+
+    def test_unprocessed_document_is_not_found(self, db):
+        """An empty RPC result means the document has no processed row"""
+        db.supabase.rpc.return_value.execute.return_value.data = []
+
+        document, error = db.update_document_tags(10, {"confirmed_tags": []})
+
+        assert document is None
+        assert "No processed document found" in error
+
+class TestDocumentCount:
+    """Unit tests for listing totals"""
+
+    def test_status_count_matches_status_listing(self, db):
+        """Status totals are a HEAD count on raw_documents, like the listing"""
+        select = db.supabase.table.return_value.select
+        select.return_value.eq.return_value.execute.return_value.count = 4
+
+        total, error = db.get_total_documents_count(status="uploaded")
+
+        assert error is None
+        assert total == 4
+        db.supabase.table.assert_called_once_with("raw_documents")
+        select.assert_called_once_with("document_id", count="exact", head=True)
+
+class TestUpdateDocument:
+    """Unit tests for raw document updates"""
+
+    def test_returns_updated_row(self, db):
+        """The updated raw_documents row is returned as-is"""
+        update = db.supabase.table.return_value.update
+        update.return_value.eq.return_value.execute.return_value.data = [{"document_id": 1, "document_name": "New.pdf"}]
+
+        document, error = db.update_document(1, {"document_name": "New.pdf"})
+
+        assert error is None
+        assert document == {"document_id": 1, "document_name": "New.pdf"}
+
+    def test_missing_row_is_not_found_without_pre_select(self, db):
+        """Existence comes from the UPDATE result, not a separate SELECT"""
+        table = db.supabase.table.return_value
+        table.update.return_value.eq.return_value.execute.return_value.data = []
+
+        document, error = db.update_document(99, {"document_name": "New.pdf"})
+
+        assert document is None
+        assert "not found" in error
+        table.select.assert_not_called()
+
+    def test_delete_missing_row_is_not_found(self, db):
+        """DELETE reports not found when no row was removed"""
+        table = db.supabase.table.return_value
+        table.delete.return_value.eq.return_value.execute.return_value.data = []
+
+        success, error = db.delete_document(99)
+
+        assert success is False
+        assert "not found" in error
+        table.select.assert_not_called()
+
+class TestExplanationRow:
+    """Unit tests for mapping explanations to table rows"""
+
+    def test_shap_data_does_not_mutate_full_response(self):
+        """SHAP data is merged into a copy of the caller's full_response"""
+        full_response = {"model": "v1"}
+        explanation = {
+            "level": "primary", "tag": "Finance", "confidence": 0.9, "source": "ai",
+            "full_response": full_response, "shap_data": {"top": ["revenue"]},
+        }
+
+        row = DatabaseService._explanation_row(explanation)
+
+        assert row["service_response"] == {"model": "v1", "shap_explainability": {"top": ["revenue"]}}
+        assert full_response == {"model": "v1"}
+
+class TestListingCap:
+    """Unit tests for listings requested without a limit"""
+
+    def test_unbounded_listing_is_capped(self, db):
+        """Without a limit the listing asks for at most MAX_LISTING_ROWS rows"""
+        ordered = db.supabase.table.return_value.select.return_value.order.return_value
+        ordered.limit.return_value.execute.return_value.data = [view_row()]
+
+        documents, error = db.get_all_documents()
+
+        assert error is None
+        assert len(documents) == 1
+        ordered.limit.assert_called_once_with(MAX_LISTING_ROWS)
+
+class TestGetDocumentById:
+    """Unit tests for single raw document reads"""
+
+    def test_single_row_lookup(self, db):
+        """The row comes back as an object via maybe_single()"""
+        single = db.supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value
+        single.execute.return_value.data = {"document_id": 5}
+
+        document, error = db.get_document_by_id(5)
+
+        assert error is None
+        assert document == {"document_id": 5}
+
+    def test_missing_row_is_not_found(self, db):
+        """maybe_single() returns no response when nothing matched"""
+        single = db.supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value
+        single.execute.return_value = None
+
+        document, error = db.get_document_by_id(5)
+
+        assert document is None
+        assert "not found" in error
+
+class TestUpdateDocumentStatus:
+    """Unit tests for raw document status writes"""
+
+    def test_check_violation_is_invalid_status(self, db):
+        """A status rejected by the table constraint reports the valid values"""
+        update = db.supabase.table.return_value.update
+        update.return_value.eq.return_value.execute.side_effect = APIError(
+            {"code": "23514", "message": 'new row violates check constraint "raw_documents_status_check"'}
+        )
+
+        success, error = db.update_document_status(5, "processed")
+
+        assert success is False
+        assert error == INVALID_STATUS_MESSAGE
+
+class TestQueryCache:
+    """Unit tests for the read cache decorators"""
+
+    @pytest.fixture
+    def cache(self):
+        """An enabled query cache for the duration of one test"""
+        cache = TTLCache(ttl=60)
+        with patch("services.database._QUERY_CACHE", cache):
+            yield cache
+
+    @staticmethod
+    def listing_execute(db):
+        ordered = db.supabase.table.return_value.select.return_value.order.return_value
+        return ordered.limit.return_value.execute
+
+    def test_cached_read_returns_a_private_copy(self, db, cache):
+        """Mutating a returned listing does not change what later callers get"""
+        execute = self.listing_execute(db)
+        execute.return_value.data = [view_row()]
+
+        first, _ = db.get_all_documents(limit=5)
+        first[0]["status"] = "mutated"
+        second, _ = db.get_all_documents(limit=5)
+
+        assert execute.call_count == 1
+        assert second[0]["status"] == "api_processed"
+
+    def test_write_clears_cached_reads(self, db, cache):
+        """A write forces the next read back to the database"""
+        execute = self.listing_execute(db)
+        execute.return_value.data = [view_row()]
+        db.supabase.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [{"document_id": 10}]
+
+        db.get_all_documents(limit=5)
+        db.update_document_status(10, "processed")
+        db.get_all_documents(limit=5)
+
+        assert execute.call_count == 2
+
+    def test_read_overlapping_a_write_is_not_stored(self, db, cache):
+        """A result fetched while the cache was cleared is returned but not cached"""
+        execute = self.listing_execute(db)
+        response = MagicMock(data=[view_row()])
+
+        def read_racing_write():
+            cache.clear()
+            return response
+
+        execute.side_effect = read_racing_write
+        db.get_all_documents(limit=5)
+        execute.side_effect = None
+        execute.return_value = response
+        db.get_all_documents(limit=5)
+
+        assert execute.call_count == 2
+
+    def test_unprocessed_documents_are_not_cached(self, db, cache):
+        """Workers polling for work always see the current queue"""
+        db.supabase.rpc.return_value.execute.return_value.data = [{"document_id": 5}]
+
+        db.get_unprocessed_documents(limit=1)
+        db.get_unprocessed_documents(limit=1)
+
+        assert db.supabase.rpc.call_count == 2
+
+    def test_single_document_reads_are_not_cached(self, db, cache):
+        """Every single-document read goes to the database"""
+        single = db.supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value
+        single.execute.return_value.data = {"document_id": 5}
+
+        db.get_document_by_id(5)
+        db.get_document_by_id(5)
+
+        assert single.execute.call_count == 2
+
+    def test_long_listings_are_not_cached(self, db, cache):
+        """Listings above MAX_CACHED_ROWS are served but never stored"""
+        execute = self.listing_execute(db)
+        execute.return_value.data = [view_row(process_id=i) for i in range(MAX_CACHED_ROWS + 1)]
+
+        db.get_all_documents()
+        db.get_all_documents()
+
+        assert execute.call_count == 2
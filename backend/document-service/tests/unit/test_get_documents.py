@@ -0,0 +1,125 @@
+import base64
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the parent directory (which contains app.py) to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from app import app
+from services.database import MAX_LISTING_ROWS, encode_cursor, decode_cursor
+
+@pytest.fixture
+def client():
+    """Flask test client fixture"""
+    with app.test_client() as client:
+        yield client
+
+@pytest.fixture
+def mock_db_service():
+    """Mock database service for unit testing"""
+    with patch('routes.documents.db_service') as mock_service:
+        yield mock_service
+
+class TestGetDocumentsListing:
+    """Unit tests for GET /documents pagination handling"""
+
+    def test_list_returns_count_and_next_cursor(self, client, mock_db_service):
+        """Full page returns the last process_id as nextCursor"""
+        print("\n[TEST] Running GET /documents with cursor pagination...")
+
+        mock_db_service.get_total_documents_count.return_value = (10, None)
+        mock_db_service.get_all_documents.return_value = ([{"process_id": 4}, {"process_id": 7}], None)
+
+        response = client.get(f'/documents?limit=2&cursor={encode_cursor(3)}')
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data["data"]["pagination"]["total"] == 10
+        assert decode_cursor(data["data"]["pagination"]["nextCursor"]) == 7
+        mock_db_service.get_all_documents.assert_called_once_with(2, None, after_id=3)
+
+        print("[PASS] Cursor pagination returned next cursor")
+
+    def test_partial_page_has_no_next_cursor(self, client, mock_db_service):
+        """A short page means there is nothing after it"""
+        print("\n[TEST] Running GET /documents last page...")
+
+        mock_db_service.get_total_documents_count.return_value = (1, None)
+        mock_db_service.get_all_documents.return_value = ([{"process_id": 4}], None)
+
+        response = client.get('/documents?limit=2')
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data["data"]["pagination"]["nextCursor"] is None
+
+        print("[PASS] Last page has no next cursor")
+
+    def test_capped_default_listing_has_next_cursor(self, client, mock_db_service):
+        """A listing without a limit that hits the row cap points at the rest"""
+        print("\n[TEST] Running GET /documents without a limit at the row cap...")
+
+        rows = [{"process_id": i} for i in range(1, MAX_LISTING_ROWS + 1)]
+        mock_db_service.get_total_documents_count.return_value = (MAX_LISTING_ROWS + 5, None)
+        mock_db_service.get_all_documents.return_value = (rows, None)
+
+        response = client.get('/documents')
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert decode_cursor(data["data"]["pagination"]["nextCursor"]) == MAX_LISTING_ROWS
+
+        print("[PASS] Capped listing returned next cursor")
+
+    def test_status_filter_uses_document_id_cursor(self, client, mock_db_service):
+        """Status listing returns raw documents, so it pages on document_id"""
+        print("\n[TEST] Running GET /documents?status= with cursor pagination...")
+
+        mock_db_service.get_total_documents_count.return_value = (5, None)
+        mock_db_service.get_documents_by_status.return_value = ([{"document_id": 12}], None)
+
+        response = client.get(f'/documents?status=uploaded&limit=1&cursor={encode_cursor(9)}')
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert decode_cursor(data["data"]["pagination"]["nextCursor"]) == 12
+        mock_db_service.get_documents_by_status.assert_called_once_with("uploaded", 1, None, after_id=9)
+
+        print("[PASS] Status listing pages on document_id")
+
+    def test_invalid_cursor_rejected(self, client, mock_db_service):
+        """A cursor that does not decode is a validation error"""
+        print("\n[TEST] Running GET /documents with a malformed cursor...")
+
+        response = client.get('/documents?cursor=not-a-cursor')
+
+        assert response.status_code == 400
+        mock_db_service.get_all_documents.assert_not_called()
+
+        print("[PASS] Malformed cursor rejected")
+
+    def test_boolean_cursor_rejected(self, client, mock_db_service):
+        """A cursor whose id is a JSON boolean is a validation error, not a 500"""
+        print("\n[TEST] Running GET /documents with a boolean cursor...")
+
+        cursor = base64.urlsafe_b64encode(b'{"id":true}').decode().rstrip('=')
+        response = client.get(f'/documents?cursor={cursor}')
+
+        assert response.status_code == 400
+        mock_db_service.get_all_documents.assert_not_called()
+
+        print("[PASS] Boolean cursor rejected")
+
+    def test_count_error_returns_500(self, client, mock_db_service):
+        """Count failure still fails the request when fetched concurrently"""
+        print("\n[TEST] Running GET /documents with count failure...")
+
+        mock_db_service.get_total_documents_count.return_value = (0, "boom")
+        mock_db_service.get_all_documents.return_value = ([], None)
+
+        response = client.get('/documents')
+
+        assert response.status_code == 500
+
+        print("[PASS] Count error surfaced as internal error")
@@ -1,17 +1,22 @@
 """
 Simple test script for the LLM classification service
 """
+import atexit
 import requests
 import json
 import time
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive connection reused by every check instead of a new one per call
+SESSION = requests.Session()
+atexit.register(SESSION.close)
+
 def test_health():
     """Test health endpoint"""
     print("🔍 Testing health endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         print(f"✅ Health check: {response.status_code}")
         print(json.dumps(response.json(), indent=2))
         return True
@@ -43,7 +48,7 @@ def test_prediction():
     
     try:
         start_time = time.time()
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/predict",
             json=request_data,
             timeout=180
@@ -96,7 +101,7 @@ def test_context_aware():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/predict",
             json=request_data,
             timeout=180